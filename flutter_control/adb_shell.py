@@ -0,0 +1,200 @@
+"""Fast ADB command paths - run device commands without a new adb process per call.
+
+- adb_exec_raw: talks the adb server's host protocol directly over TCP
+- AdbShellSession: a persistent `adb shell` fed commands over stdin
+"""
+
+import asyncio
+import logging
+import os
+import re
+import secrets
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger('adb-shell')
+
+
+class AdbShellError(Exception):
+    """Raised when a command could not be run through the shell session."""
+
+
+def _adb_server_address() -> Tuple[str, int]:
+    """Resolve the adb server address the same way the adb client does."""
+    socket_spec = os.environ.get("ADB_SERVER_SOCKET", "")
+    if socket_spec.startswith("tcp:"):
+        host, _, port = socket_spec[4:].rpartition(":")
+        return host or "127.0.0.1", int(port)
+    return "127.0.0.1", int(os.environ.get("ANDROID_ADB_SERVER_PORT", 5037))
+
+
+async def _adb_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, service: str):
+    """Send one length-prefixed host-protocol request and check the OKAY/FAIL status."""
+    payload = service.encode()
+    writer.write(b"%04x%s" % (len(payload), payload))
+    await writer.drain()
+    status = await reader.readexactly(4)
+    if status != b"OKAY":
+        length = int(await reader.readexactly(4), 16)
+        message = (await reader.readexactly(length)).decode("utf-8", errors="replace")
+        raise AdbShellError(f"{service}: {message or status.decode(errors='replace')}")
+
+
+async def adb_exec_raw(device: Optional[str], command: str, timeout: float = 10) -> bytes:
+    """
+    Run `exec:<command>` on a device via the adb server socket and return stdout.
+
+    Equivalent to `adb [-s device] exec-out <command>` without spawning the
+    adb client: the output is read straight off the TCP connection. With no
+    device, $ANDROID_SERIAL is honoured the same way the adb client does.
+    """
+    host, port = _adb_server_address()
+    device = device or os.environ.get("ANDROID_SERIAL")
+
+    async def _run() -> bytes:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await _adb_request(reader, writer, f"host:transport:{device}" if device else "host:transport-any")
+            await _adb_request(reader, writer, f"exec:{command}")
+            return await reader.read()  # until the device closes the stream
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    try:
+        async with asyncio.timeout(timeout):
+            return await _run()
+    except AdbShellError:
+        raise
+    except asyncio.TimeoutError as e:
+        raise AdbShellError(f"adb server timed out: {command}") from e
+    except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+        raise AdbShellError(f"adb server: {e}") from e
+
+
+class AdbShellSession:
+    """
+    A long-lived `adb shell` process for one device.
+
+    Commands are written to the shell's stdin and their output is read back
+    up to a per-session end marker carrying the exit status. This skips the
+    adb client startup and server handshake that `adb exec-out`/`adb logcat`
+    pay on every invocation. Commands are serialized with a lock; if a
+    command fails or times out mid-stream the shell is killed and restarted
+    on the next call so a half-read output can't leak into the next one.
+    """
+
+    def __init__(self, adb_path: str, device: Optional[str] = None):
+        self.adb_path = adb_path
+        self.device = device
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        token = secrets.token_hex(8)
+        self._marker = f"__FC_END_{token}_".encode()
+        self._marker_re = re.compile(rb"__FC_END_" + token.encode() + rb"_(\d+)__\n?$")
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _start(self):
+        cmd = [self.adb_path]
+        if self.device:
+            cmd.extend(["-s", self.device])
+        cmd.append("shell")
+        self._process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        logger.debug(f"adb shell started for {self.device or 'default device'}")
+
+    async def exec(self, command: str, timeout: float = 10) -> Tuple[int, bytes]:
+        """Run a shell command on the device, returning (exit_code, stdout)."""
+        async with self._lock:
+            if not self.is_running:
+                await self._start()
+            try:
+                async with asyncio.timeout(timeout):
+                    return await self._exec(command)
+            except asyncio.CancelledError:
+                # The output may be half-read; don't let it leak into the next command
+                await self._kill()
+                raise
+            except Exception as e:
+                await self._kill()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise AdbShellError(f"adb shell timed out: {command}") from e
+                raise AdbShellError(str(e)) from e
+
+    async def _exec(self, command: str) -> Tuple[int, bytes]:
+        process = self._process
+        # Discard the command's stderr so binary stdout (screencap) stays clean
+        process.stdin.write(f"{{ {command}; }} 2>/dev/null; echo \"{self._marker.decode()}$?__\"\n".encode())
+        await process.stdin.drain()
+
+        buf = bytearray()
+        idx = -1
+        while True:
+            chunk = await process.stdout.read(65536)
+            if not chunk:
+                raise AdbShellError("adb shell exited")
+            buf += chunk
+            # Only the tail can hold the marker; don't rescan the whole buffer.
+            # Once found, keep its position: the exit-code trailer may still be
+            # in flight, and the next read's window would start past it.
+            if idx == -1:
+                idx = buf.rfind(self._marker, max(0, len(buf) - len(chunk) - len(self._marker)))
+            if idx != -1:
+                match = self._marker_re.search(buf, idx)
+                if match:
+                    return int(match.group(1)), bytes(buf[:idx])
+
+    async def _kill(self):
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.kill()
+            await process.wait()
+        except ProcessLookupError:
+            pass
+
+    async def close(self):
+        """Exit the shell (killing it if it doesn't go quietly)."""
+        async with self._lock:
+            process = self._process
+            if process is None or process.returncode is not None:
+                self._process = None
+                return
+            try:
+                process.stdin.write(b"exit\n")
+                await process.stdin.drain()
+                async with asyncio.timeout(2):
+                    await process.wait()
+                self._process = None
+            except Exception:
+                await self._kill()
+
+
+# Global sessions, one per device (None = adb's default device)
+_sessions: Dict[Optional[str], AdbShellSession] = {}
+
+
+def get_adb_shell(adb_path: str, device: Optional[str] = None) -> AdbShellSession:
+    """Get or create the shell session for a device."""
+    session = _sessions.get(device)
+    if session is None:
+        session = _sessions[device] = AdbShellSession(adb_path, device)
+    return session
+
+
+async def close_adb_shells():
+    """Close all shell sessions (called on server shutdown)."""
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for session in sessions:
+        await session.close()
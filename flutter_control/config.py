@@ -23,9 +23,19 @@ OBSERVATORY_PORT_IOS = int(os.getenv("FLUTTER_CONTROL_OBSERVATORY_IOS", "9224"))
 # Default app ID for Maestro (can be overridden per-call)
 DEFAULT_APP_ID = os.getenv("FLUTTER_CONTROL_APP_ID", "com.example.flutter_control_test_app")
 
+# flutter_screenshot starts its Maestro fallback when the native capture fails or
+# is still running after this many seconds (a started Maestro capture can't be
+# cancelled, so keep this above a normal adb/simctl capture)
+SCREENSHOT_FALLBACK_DELAY = float(os.getenv("FLUTTER_CONTROL_SCREENSHOT_FALLBACK_DELAY", "5.0"))
+
 # Emulator/Simulator defaults
 HEADLESS_DEFAULT = os.getenv("FLUTTER_CONTROL_HEADLESS", "false").lower() == "true"
 
+# Tracing - fraction of successful tool calls whose trace is kept (failures always are)
+TRACE_SAMPLE_RATE = float(os.getenv("FLUTTER_CONTROL_TRACE_SAMPLE_RATE", "1.0"))
+# Set to "false" (or "0") to skip routine happy-path trace events; errors are still traced
+TRACE_ENABLED = os.getenv("FLUTTER_CONTROL_TRACE", "true").lower() not in ("false", "0")
+
 # Logging
 LOG_DIR = Path.home() / "Library" / "Logs" / "flutter-control"
 MAESTRO_FLOW_DIR = LOG_DIR / "maestro"
@@ -1,10 +1,11 @@
 """Flutter Driver client - connects to Observatory via WebSocket."""
 
 import asyncio
-import json
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 
+import orjson
+
 try:
     import websockets
     from websockets.client import WebSocketClientProtocol
@@ -47,6 +48,11 @@ class FlutterDriverClient:
         """Check if connected to Observatory."""
         return self.ws is not None and self.isolate_id is not None
 
+    @property
+    def uri(self) -> Optional[str]:
+        """VM service URI this client connects to, if one was given."""
+        return self._uri
+
     @property
     def ws_url(self) -> str:
         """WebSocket URL for Observatory."""
@@ -177,7 +183,7 @@ class FlutterDriverClient:
         """Receive messages from WebSocket."""
         try:
             async for message in self.ws:  # type: ignore
-                data = json.loads(message)
+                data = orjson.loads(message)
                 req_id = data.get("id")
                 if req_id and req_id in self._pending:
                     self._pending[req_id].set_result(data)
@@ -204,7 +210,7 @@ class FlutterDriverClient:
         self._pending[req_id] = future
 
         try:
-            await self.ws.send(json.dumps(request))
+            await self.ws.send(orjson.dumps(request).decode())
             data = await asyncio.wait_for(future, timeout=30)
             return self.protocol.parse_response(data)
         except asyncio.TimeoutError:
@@ -251,7 +257,7 @@ class FlutterDriverClient:
         self._pending[req_id] = future
 
         try:
-            await self.ws.send(json.dumps(request))
+            await self.ws.send(orjson.dumps(request).decode())
             timeout = command.timeout or 30
             data = await asyncio.wait_for(future, timeout=timeout)
             response = self.protocol.parse_response(data)
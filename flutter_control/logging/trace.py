@@ -1,15 +1,18 @@
 """Trace context and logging for debugging."""
 
-import json
 import time
 import secrets
 import sys
+from collections import deque
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Deque
 from datetime import datetime
 
-from ..config import LOG_DIR
+import orjson
+
+from ..config import LOG_DIR, TRACE_ENABLED
 
 
 def generate_trace_id() -> str:
@@ -17,7 +20,7 @@ def generate_trace_id() -> str:
     return secrets.token_hex(3)  # 6 chars
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceEntry:
     """A single trace log entry."""
     elapsed_ms: int
@@ -32,7 +35,7 @@ class TraceEntry:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TraceContext:
     """Context for tracing a single MCP tool call."""
     trace_id: str
@@ -40,12 +43,18 @@ class TraceContext:
     arguments: Dict[str, Any]
     start_time: float = field(default_factory=time.time)
     entries: List[TraceEntry] = field(default_factory=list)
+    # False when routine events are switched off; callers check it before
+    # formatting happy-path details (errors are logged regardless)
+    enabled: bool = TRACE_ENABLED
+    # Serialized form, cached when the trace is saved until another entry is logged
+    _json: Optional[bytes] = field(default=None, repr=False)
 
     def log(self, event: str, detail: str = ""):
         """Add a trace entry."""
         elapsed_ms = int((time.time() - self.start_time) * 1000)
         entry = TraceEntry(elapsed_ms=elapsed_ms, event=event, detail=detail)
         self.entries.append(entry)
+        self._json = None  # logged after save (e.g. a background leg); re-serialize on read
         print(f"[{self.trace_id}] {elapsed_ms:6d}ms {event:15s} {detail}", file=sys.stderr, flush=True)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -58,34 +67,58 @@ class TraceContext:
             "entries": [e.to_dict() for e in self.entries],
         }
 
+    def to_json(self) -> bytes:
+        """JSON bytes for this trace (cached from save() unless entries were added since)."""
+        if self._json is None:
+            return orjson.dumps(self.to_dict())
+        return self._json
+
     def save(self):
         """Append trace to the traces log file."""
+        self._json = orjson.dumps(self.to_dict())
         traces_file = LOG_DIR / "traces.jsonl"
-        with open(traces_file, "a") as f:
-            f.write(json.dumps(self.to_dict()) + "\n")
+        with open(traces_file, "ab") as f:
+            f.write(self._json + b"\n")
 
 
-_recent_traces: List[TraceContext] = []
 MAX_RECENT_TRACES = 100
+# Ring buffer of recent traces plus an index by ID for get_trace()
+_recent_traces: Deque[TraceContext] = deque(maxlen=MAX_RECENT_TRACES)
+_traces_by_id: Dict[str, TraceContext] = {}
 
 
 def log_trace(trace: TraceContext):
     """Store trace in memory and save to disk."""
-    global _recent_traces
+    if len(_recent_traces) == MAX_RECENT_TRACES:
+        evicted = _recent_traces[0]
+        if _traces_by_id.get(evicted.trace_id) is evicted:
+            del _traces_by_id[evicted.trace_id]
     _recent_traces.append(trace)
-    if len(_recent_traces) > MAX_RECENT_TRACES:
-        _recent_traces = _recent_traces[-MAX_RECENT_TRACES:]
+    _traces_by_id[trace.trace_id] = trace
     trace.save()
 
 
 def get_recent_traces(count: int = 10) -> List[Dict[str, Any]]:
-    """Get recent traces for debugging."""
-    return [t.to_dict() for t in _recent_traces[-count:]]
+    """Get recent traces for debugging (oldest first)."""
+    recent = [t.to_dict() for t in islice(reversed(_recent_traces), max(count, 0))]
+    recent.reverse()
+    return recent
 
 
 def get_trace(trace_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific trace by ID."""
-    for t in reversed(_recent_traces):
-        if t.trace_id == trace_id:
-            return t.to_dict()
-    return None
+    trace = _traces_by_id.get(trace_id)
+    return trace.to_dict() if trace else None
+
+
+def get_recent_traces_json(count: int = 10) -> List[orjson.Fragment]:
+    """Like get_recent_traces, but as pre-serialized orjson fragments."""
+    recent = [orjson.Fragment(t.to_json()) for t in islice(reversed(_recent_traces), max(count, 0))]
+    recent.reverse()
+    return recent
+
+
+def get_trace_json(trace_id: str) -> Optional[orjson.Fragment]:
+    """Like get_trace, but as a pre-serialized orjson fragment."""
+    trace = _traces_by_id.get(trace_id)
+    return orjson.Fragment(trace.to_json()) if trace else None
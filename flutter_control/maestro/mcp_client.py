@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Any, Optional
 import base64
 
+import orjson
+
 from ..logging.trace import TraceContext
 
 
@@ -32,6 +34,10 @@ class MaestroMCPClient:
         self._maestro_path = self._find_maestro()
         self._connected = False
         self._device_id: Optional[str] = None
+        # One request on the stdio stream at a time; bytes read past a newline
+        # are kept for the next response
+        self._call_lock = asyncio.Lock()
+        self._read_buf = bytearray()
 
     @classmethod
     async def get_instance(cls) -> "MaestroMCPClient":
@@ -90,65 +96,81 @@ class MaestroMCPClient:
             )
             self._connected = True
             self._device_id = None  # Reset device ID on reconnect
+            self._read_buf.clear()
             return True
         except Exception as e:
             self._connected = False
             return False
 
-    async def _read_line(self, timeout: float) -> bytes:
+    async def _read_line(self, timeout: Optional[float]) -> bytes:
         """Read a newline-delimited line, handling large responses (>64KB).
 
         asyncio's readline() has a 64KB default limit. Screenshot responses
-        can be 130KB+, so we read in chunks until we find a newline.
+        can be 130KB+, so we read in chunks until we find a newline. Anything
+        after the newline stays in the buffer for the next line.
         """
-        chunks = []
+        buf = self._read_buf
         chunk_size = 64 * 1024  # 64KB chunks
 
         async def read_until_newline():
+            start = 0
             while True:
-                chunk = await self._process.stdout.read(chunk_size)
-                if not chunk:
-                    return b"".join(chunks) if chunks else b""
-
-                # Check if chunk contains newline
-                newline_pos = chunk.find(b"\n")
+                newline_pos = buf.find(b"\n", start)
                 if newline_pos >= 0:
                     # Include everything up to and including newline
-                    chunks.append(chunk[:newline_pos + 1])
-                    return b"".join(chunks)
-                else:
-                    chunks.append(chunk)
+                    line = bytes(buf[:newline_pos + 1])
+                    del buf[:newline_pos + 1]
+                    return line
+                start = len(buf)
+
+                chunk = await self._process.stdout.read(chunk_size)
+                if not chunk:
+                    line = bytes(buf)
+                    buf.clear()
+                    return line
+                buf.extend(chunk)
 
         return await asyncio.wait_for(read_until_newline(), timeout=timeout)
 
     async def _call(self, method: str, params: dict, timeout: float = 30) -> dict:
         """Send a JSON-RPC call to maestro mcp."""
+        async with self._call_lock:
+            return await self._call_locked(method, params, timeout)
+
+    async def _call_locked(self, method: str, params: dict, timeout: float) -> dict:
         if not await self._ensure_connected():
             return {"error": "Maestro MCP not available"}
 
         self._request_id += 1
+        request_id = self._request_id
         request = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": self._request_id
+            "id": request_id
         }
 
-        request_line = json.dumps(request) + "\n"
+        request_line = orjson.dumps(request) + b"\n"
 
         try:
-            self._process.stdin.write(request_line.encode())
+            self._process.stdin.write(request_line)
             await self._process.stdin.drain()
 
-            # Read response - MCP uses newline-delimited JSON
-            # Use custom reader to handle large responses (screenshots can be 130KB+)
-            response_line = await self._read_line(timeout)
-
-            if not response_line:
-                self._connected = False
-                return {"error": "Maestro MCP process died"}
-
-            return json.loads(response_line.decode())
+            async with asyncio.timeout(timeout):
+                while True:
+                    # Read response - MCP uses newline-delimited JSON
+                    # Use custom reader to handle large responses (screenshots can be 130KB+)
+                    response_line = await self._read_line(None)
+
+                    if not response_line:
+                        self._connected = False
+                        return {"error": "Maestro MCP process died"}
+
+                    # Skip replies to earlier requests abandoned mid-read
+                    # (timed out or cancelled) and notifications
+                    response = orjson.loads(response_line)
+                    if response.get("id") == request_id:
+                        return response
 
         except asyncio.TimeoutError:
             return {"error": f"Timeout after {timeout}s"}
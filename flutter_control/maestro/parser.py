@@ -4,6 +4,10 @@ import re
 from dataclasses import dataclass, field
 from typing import Optional
 
+# Maestro outputs paths like: /Users/.../.maestro/tests/2026-01-31_134000
+_OUTPUT_DIR_RE = re.compile(r"(/[^\s]+/\.maestro/tests/\d{4}-\d{2}-\d{2}_\d+)")
+_NOT_FOUND_RE = re.compile(r"Unable to find[^:]*: (.+)")
+
 
 @dataclass
 class MaestroResult:
@@ -15,6 +19,7 @@ class MaestroResult:
     error_message: Optional[str] = None
     output_dir: Optional[str] = None  # Test output directory
     screenshot_base64: Optional[str] = None  # Base64-encoded screenshot
+    screenshot_file: Optional[str] = None  # Screenshot written to disk by a legacy flow
 
     def to_dict(self):
         return {
@@ -23,6 +28,7 @@ class MaestroResult:
             "error_message": self.error_message,
             "output_dir": self.output_dir,
             "screenshot_base64": self.screenshot_base64,
+            "screenshot_file": self.screenshot_file,
         }
 
 
@@ -35,14 +41,13 @@ def parse_maestro_output(exit_code: int, stdout: str, stderr: str) -> MaestroRes
     combined = stdout + stderr
 
     # Extract test output directory (appears in both success and failure)
-    # Maestro outputs paths like: /Users/.../.maestro/tests/2026-01-31_134000
-    dir_match = re.search(r"(/[^\s]+/\.maestro/tests/\d{4}-\d{2}-\d{2}_\d+)", combined)
+    dir_match = _OUTPUT_DIR_RE.search(combined)
     if dir_match:
         output_dir = dir_match.group(1)
 
     if not success:
         if "Unable to find" in combined or "Element not found" in combined:
-            match = re.search(r"Unable to find[^:]*: (.+)", combined)
+            match = _NOT_FOUND_RE.search(combined)
             if match:
                 error_message = f"Element not found: {match.group(1)}"
             else:
@@ -9,7 +9,6 @@ if MCP fails or for operations not supported by MCP.
 """
 
 import asyncio
-import base64
 import shutil
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -327,7 +326,7 @@ class MaestroWrapper:
         return await self.execute_flow(flow_path, trace, timeout, device)
 
     async def screenshot(self, trace: TraceContext, timeout: int = DEFAULT_TIMEOUT, device: Optional[str] = None, app_id: str = DEFAULT_APP_ID) -> MaestroResult:
-        """Take a screenshot and return base64-encoded image. Uses fast MCP mode when available."""
+        """Take a screenshot (base64 via MCP, or a file path in legacy mode). Uses fast MCP mode when available."""
         from ..config import LOG_DIR
 
         # Try fast MCP mode first
@@ -365,16 +364,17 @@ class MaestroWrapper:
         # Maestro adds .png extension automatically
         screenshot_path = Path(screenshot_dir) / f"{screenshot_name}.png"
         trace.log("SCREENSHOT_PATH", str(screenshot_path))
-        if screenshot_path.exists():
-            try:
-                image_data = screenshot_path.read_bytes()
-                result.screenshot_base64 = base64.b64encode(image_data).decode("utf-8")
-                result.success = True  # Override success if we got the screenshot
-                result.error_message = None
-                trace.log("SCREENSHOT_OK", f"{len(image_data)} bytes")
-            except Exception as e:
-                trace.log("SCREENSHOT_ERR", str(e))
-        else:
+        # Hand back the path rather than reading and base64-encoding the PNG
+        try:
+            size = screenshot_path.stat().st_size
+        except FileNotFoundError:
             trace.log("SCREENSHOT_NOT_FOUND", str(screenshot_path))
+        except OSError as e:
+            trace.log("SCREENSHOT_ERR", str(e))
+        else:
+            result.screenshot_file = str(screenshot_path)
+            result.success = True  # Override success if we got the screenshot
+            result.error_message = None
+            trace.log("SCREENSHOT_OK", f"{size} bytes")
 
         return result
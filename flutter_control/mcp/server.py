@@ -1,22 +1,23 @@
 """FastAPI MCP server for Flutter Control."""
 
 import asyncio
-import json
+import hmac
 import os
-import platform
 import shutil
 import tempfile
+import types
 import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
+import orjson
 from fastapi import FastAPI, HTTPException, Header, Request, Response
 from pydantic import BaseModel
 
 from ..config import TOKEN, MCP_PORT, MCP_HOST, LOG_DIR
-from .tools import TOOLS, handle_tool_call
-from ..__version__ import __version__ as VERSION
+from .tools import close_driver_clients, get_tools_json_bytes, get_version_info, handle_tool_call
 from ..maestro.mcp_client import MaestroMCPClient
+from ..adb_shell import close_adb_shells
 START_TIME = datetime.now(timezone.utc)
 
 # Detect platform based on port
@@ -25,35 +26,19 @@ def _get_platform():
     port = int(os.environ.get("FLUTTER_CONTROL_PORT", MCP_PORT))
     return "ios" if port in (9226, 9227) else "android"
 
-def _get_deployed_at():
-    """Get deployment time from server.py mtime."""
-    try:
-        server_file = Path(__file__)
-        mtime = server_file.stat().st_mtime
-        return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat().replace("+00:00", "Z")
-    except:
-        return None
-
-def _get_git_commit():
-    """Get git commit if available."""
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["git", "rev-parse", "--short", "HEAD"],
-            cwd=Path(__file__).parent.parent.parent,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except:
-        pass
-    return None
 
 app = FastAPI(title="Flutter Control MCP Server")
 
 
+def _json_response(payload: Dict[str, Any]) -> Response:
+    """Serialize a response body with orjson, bypassing FastAPI's jsonable_encoder."""
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+# Tool schemas are pre-serialized; embed them verbatim rather than re-encoding per request
+_TOOLS_FRAGMENT = orjson.Fragment(get_tools_json_bytes())
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize Maestro MCP client on server startup for fast operations."""
@@ -70,11 +55,19 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up Maestro MCP client on server shutdown."""
+    """Clean up Maestro MCP client, driver connections and adb shell sessions on server shutdown."""
     try:
         await MaestroMCPClient.shutdown()
     except Exception:
         pass  # Ignore errors during shutdown
+    try:
+        await close_driver_clients()
+    except Exception:
+        pass
+    try:
+        await close_adb_shells()
+    except Exception:
+        pass
 
 
 class ToolCallRequest(BaseModel):
@@ -82,6 +75,10 @@ class ToolCallRequest(BaseModel):
     arguments: Dict[str, Any] = {}
 
 
+# Shared read-only stand-in for absent MCP params (avoids a fresh {} per request)
+_EMPTY: Mapping[str, Any] = types.MappingProxyType({})
+
+
 class MCPRequest(BaseModel):
     jsonrpc: str = "2.0"
     id: Optional[int] = None
@@ -89,14 +86,18 @@ class MCPRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None
 
 
+# Length of a valid "Bearer <token>" header; anything else is rejected
+# before any slicing or comparison.
+_EXPECTED_AUTH_LEN = 7 + len(TOKEN) if TOKEN else 0
+_TOKEN_BYTES = TOKEN.encode() if TOKEN else b""
+
+
 def verify_token(authorization: Optional[str]) -> bool:
     if not TOKEN:
         return True
-    if not authorization:
+    if authorization is None or len(authorization) != _EXPECTED_AUTH_LEN:
         return False
-    if not authorization.startswith("Bearer "):
-        return False
-    return authorization[7:] == TOKEN
+    return authorization[:7] == "Bearer " and hmac.compare_digest(authorization[7:].encode(), _TOKEN_BYTES)
 
 
 @app.get("/health")
@@ -126,30 +127,25 @@ async def maestro_status():
 async def version():
     """Get service version and deployment info."""
     uptime = (datetime.now(timezone.utc) - START_TIME).total_seconds()
-    return {
-        "service": "flutter-control",
-        "platform": _get_platform(),
-        "version": VERSION,
-        "deployed_at": _get_deployed_at(),
-        "git_commit": _get_git_commit(),
+    return _json_response({
+        **await get_version_info(),
         "started_at": START_TIME.isoformat() + "Z",
         "uptime_seconds": int(uptime),
-        "hostname": platform.node(),
-    }
+    })
 
 
 @app.get("/tools")
 async def list_tools(authorization: Optional[str] = Header(None)):
     if not verify_token(authorization):
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return {"tools": TOOLS}
+    return _json_response({"tools": _TOOLS_FRAGMENT})
 
 
 @app.post("/call")
 async def call_tool(request: ToolCallRequest, authorization: Optional[str] = Header(None)):
     if not verify_token(authorization):
         raise HTTPException(status_code=401, detail="Unauthorized")
-    return await handle_tool_call(request.name, request.arguments)
+    return _json_response(await handle_tool_call(request.name, request.arguments))
 
 
 @app.post("/mcp")
@@ -158,7 +154,7 @@ async def mcp_endpoint(request: MCPRequest, authorization: Optional[str] = Heade
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     if request.method == "initialize":
-        return {
+        return _json_response({
             "jsonrpc": "2.0",
             "id": request.id,
             "result": {
@@ -166,22 +162,22 @@ async def mcp_endpoint(request: MCPRequest, authorization: Optional[str] = Heade
                 "capabilities": {"tools": {}},
                 "serverInfo": {"name": "flutter-control", "version": "0.1.0"},
             },
-        }
+        })
     elif request.method == "tools/list":
-        return {"jsonrpc": "2.0", "id": request.id, "result": {"tools": TOOLS}}
+        return _json_response({"jsonrpc": "2.0", "id": request.id, "result": {"tools": _TOOLS_FRAGMENT}})
     elif request.method == "tools/call":
-        params = request.params or {}
+        params = request.params if request.params is not None else _EMPTY
         result = await handle_tool_call(params.get("name", ""), params.get("arguments", {}))
-        return {
+        return _json_response({
             "jsonrpc": "2.0",
             "id": request.id,
             "result": {
-                "content": [{"type": "text", "text": json.dumps(result)}],
-                "isError": not result.get("success", False),
+                "content": [{"type": "text", "text": orjson.dumps(result).decode()}],
+                "isError": not result["success"],
             },
-        }
+        })
     else:
-        return {"jsonrpc": "2.0", "id": request.id, "error": {"code": -32601, "message": f"Method not found: {request.method}"}}
+        return _json_response({"jsonrpc": "2.0", "id": request.id, "error": {"code": -32601, "message": f"Method not found: {request.method}"}})
 
 
 @app.post("/upload-app")
@@ -382,7 +378,9 @@ async def _install_android_app(
 
 def main():
     import uvicorn
-    uvicorn.run(app, host=MCP_HOST, port=MCP_PORT)
+    # "auto" runs on uvloop (and parses HTTP with httptools) when the optional
+    # `speedups` extra is installed, falling back to the stdlib asyncio loop
+    uvicorn.run(app, host=MCP_HOST, port=MCP_PORT, loop="auto", http="auto")
 
 
 if __name__ == "__main__":
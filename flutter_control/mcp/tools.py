@@ -2,219 +2,398 @@
 
 import asyncio
 import base64
+import functools
+import os
+import random
+import re
 import shutil
+import sys
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
-from ..maestro import MaestroWrapper
-from ..logging.trace import TraceContext, generate_trace_id, log_trace, get_recent_traces, get_trace
-from ..config import OBSERVATORY_PORT_ANDROID, OBSERVATORY_PORT_IOS
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
-_maestro = MaestroWrapper()
+import orjson
 
-# Flutter Driver client (lazy initialized)
-_driver_client = None
+from ..__version__ import __version__
+from ..maestro import MaestroWrapper
+from ..maestro.parser import MaestroResult
+from ..logging.trace import TraceContext, generate_trace_id, log_trace, get_recent_traces_json, get_trace_json
+from ..config import (
+    HEADLESS_DEFAULT, MCP_PORT, OBSERVATORY_PORT_ANDROID, OBSERVATORY_PORT_IOS, SCREENSHOT_FALLBACK_DELAY, TRACE_SAMPLE_RATE,
+)
+from ..adb_proxy import get_adb_proxy
+from ..adb_shell import AdbShellError, adb_exec_raw, get_adb_shell
+from ..driver import Finder, FlutterDriverClient
+from ..unified import UnifiedExecutor
+
+try:
+    from zeroconf import ServiceStateChange
+    from zeroconf.asyncio import AsyncServiceBrowser, AsyncZeroconf
+except ImportError:
+    AsyncZeroconf = None  # type: ignore  # falls back to the dns-sd CLI
+
+# Server platform is fixed by the port it was started on (9226/9227=iOS, 9225=Android)
+_SERVER_PORT = MCP_PORT
+_IS_IOS_SERVER = _SERVER_PORT in (9226, 9227)
+_PLATFORM_STR = "ios" if _IS_IOS_SERVER else "android"
+
+
+@functools.lru_cache(maxsize=256)
+def _is_ios_udid(device_id: Optional[str]) -> bool:
+    """Whether a device ID looks like a simulator UDID (8-4-4-4-12 UUID form)."""
+    return (
+        bool(device_id)
+        and len(device_id) == 36
+        and device_id[8] == device_id[13] == device_id[18] == device_id[23] == "-"
+    )
+
+
+@functools.cache
+def _get_maestro() -> MaestroWrapper:
+    """Get the Maestro wrapper (created on first use, not at import)."""
+    return MaestroWrapper()
+
+
+# Precompiled patterns for VM service discovery / output scanning
+_VM_PORT_RE = re.compile(r":(\d+)/")  # port in a VM service URI
+_HTTP_URI_RE = re.compile(r"http://[^\s]+")
+_HTTP_URI_BYTES_RE = re.compile(rb"http://[^\s]+")
+_VM_SERVICE_MARKERS = (b"Dart VM service is listening on", b"Observatory listening on")
+_MDNS_PORT_RE = re.compile(r":(\d+)\s")  # dns-sd -L "can be reached at host:PORT"
+_AUTH_CODE_RE = re.compile(r"authCode=(\S+)")
+_LSOF_PORT_RE = re.compile(r"127\.0\.0\.1:(\d+)")
+_EMU_RE = re.compile(rb"^(emulator-\d+)\s+device\b", re.MULTILINE)  # online emulator in `adb devices`
+
+# Flutter Driver clients by local (forwarded) VM service port, lazily created;
+# separate ports (e.g. an Android and an iOS app) get independent connections
+_driver_clients: Dict[int, FlutterDriverClient] = {}
+
+# Clients created by flutter_driver_connect, keyed by (host, port, uri) so that
+# reconnecting to the same VM service reuses its open WebSocket
+_driver_pool: Dict[Tuple[str, int, Optional[str]], FlutterDriverClient] = {}
+
+# Device each port's connection was discovered for by flutter_driver_ensure_connected
+_ensured_devices: Dict[int, Optional[str]] = {}
 
 # Unified executor (lazy initialized)
 _unified_executor = None
 
 
-def _get_driver_client(port: int = OBSERVATORY_PORT_ANDROID):
-    """Get or create Flutter Driver client."""
-    global _driver_client
-    if _driver_client is None:
-        from ..driver import FlutterDriverClient
-        _driver_client = FlutterDriverClient(port=port)
-    return _driver_client
+def _get_driver_client(port: int = OBSERVATORY_PORT_ANDROID) -> FlutterDriverClient:
+    """Get or create the Flutter Driver client for a port."""
+    client = _driver_clients.get(port)
+    if client is None:
+        client = _driver_clients[port] = FlutterDriverClient(port=port)
+    return client
 
 
-async def _rediscover_driver(trace) -> "FlutterDriverClient":
-    """Rediscover and reconnect to Flutter Driver. Returns new client or None."""
-    global _driver_client
-    from ..driver import FlutterDriverClient
+def _set_driver_client(port: int, client: FlutterDriverClient) -> None:
+    """Make client the active driver for port."""
+    global _unified_executor
+    if _driver_clients.get(port) is client:
+        return
+    _driver_clients[port] = client
+    if port == OBSERVATORY_PORT_ANDROID:
+        _unified_executor = None  # Reset executor to pick up new client
 
-    trace.log("REDISCOVER_START", "Discovering fresh VM service URI")
-    uri = await _discover_vm_service_uri(trace)
+
+async def _build_forwarded_driver(
+    trace: TraceContext, port: int = OBSERVATORY_PORT_ANDROID, use_cache: bool = True
+) -> Optional[FlutterDriverClient]:
+    """Discover the VM service, forward it to localhost:port and connect a new client.
+
+    Returns the connected client, or None if any step fails.
+    """
+    uri = await _discover_vm_service_uri(trace, use_cache=use_cache)
     if not uri:
-        trace.log("REDISCOVER_FAIL", "No VM service URI found")
+        trace.log("DRIVER_ERR", "No VM service URI found during rediscovery")
         return None
 
     # Extract port and set up forwarding
-    import re
-    port_match = re.search(r":(\d+)/", uri)
+    port_match = _VM_PORT_RE.search(uri)
     if not port_match:
+        trace.log("DRIVER_ERR", f"Could not parse port from URI: {uri}")
         return None
 
     device_port = int(port_match.group(1))
-    host_port = OBSERVATORY_PORT_ANDROID
-    if not await _forward_vm_service_port(trace, device_port, host_port):
+    if not await _forward_vm_service_port(trace, device_port, port):
+        trace.log("DRIVER_ERR", f"Failed to forward port {device_port}")
         return None
 
     # Create new client with fresh URI
-    forwarded_uri = uri.replace(f"127.0.0.1:{device_port}", f"localhost:{host_port}")
-    _driver_client = FlutterDriverClient(port=host_port, uri=forwarded_uri)
-
-    if await _driver_client.connect(trace):
-        trace.log("REDISCOVER_OK", f"Connected: {forwarded_uri}")
-        return _driver_client
+    forwarded_uri = uri.replace(f"127.0.0.1:{device_port}", f"localhost:{port}")
+    client = FlutterDriverClient(port=port, uri=forwarded_uri)
+    if await client.connect(trace):
+        trace.log("DRIVER_RECONNECTED", f"Connected with fresh URI: {forwarded_uri}")
+        return client
 
+    trace.log("DRIVER_ERR", "Failed to connect with fresh URI")
+    _invalidate_uri_cache()
+    _invalidate_forward_cache()
     return None
 
 
+async def _rediscover_driver(trace) -> Optional[FlutterDriverClient]:
+    """Rediscover and reconnect to Flutter Driver. Returns new client or None."""
+    trace.log("REDISCOVER_START", "Discovering fresh VM service URI")
+    client = await _build_forwarded_driver(trace, OBSERVATORY_PORT_ANDROID, use_cache=False)
+    if client is None:
+        trace.log("REDISCOVER_FAIL", "Rediscovery failed")
+        return None
+
+    # The executor asked for this client; swap it in without resetting the executor
+    _driver_clients[OBSERVATORY_PORT_ANDROID] = client
+    return client
+
+
+async def close_driver_clients(port: Optional[int] = None) -> None:
+    """Disconnect the active and pooled driver clients for port (default: all)."""
+    global _unified_executor
+    if port is None:
+        clients = [*_driver_clients.values(), *_driver_pool.values()]
+        _driver_clients.clear()
+        _driver_pool.clear()
+        _ensured_devices.clear()
+    else:
+        _ensured_devices.pop(port, None)
+        active = _driver_clients.pop(port, None)
+        clients = [active] if active else []
+        clients.extend(_driver_pool.pop(key) for key in [k for k in _driver_pool if k[1] == port])
+    # A client can be both active and pooled; close it once
+    for client in {id(c): c for c in clients}.values():
+        await client.disconnect()
+    if clients:
+        _unified_executor = None
+
+
 def _get_unified_executor():
     """Get or create unified executor."""
     global _unified_executor
     if _unified_executor is None:
-        from ..unified import UnifiedExecutor
-        _unified_executor = UnifiedExecutor(_maestro, _get_driver_client(), rediscover_callback=_rediscover_driver)
+        _unified_executor = UnifiedExecutor(_get_maestro(), _get_driver_client(), rediscover_callback=_rediscover_driver)
     return _unified_executor
 
 
+# Per-port locks serializing reconnect/rediscovery, so concurrent tool calls
+# don't race to connect the same client
+_connect_locks: Dict[int, asyncio.Lock] = {}
+
+
 async def _ensure_driver_connected(trace: TraceContext, port: int = OBSERVATORY_PORT_ANDROID) -> bool:
     """Ensure driver is connected, with auto-rediscovery if needed."""
-    global _driver_client, _unified_executor
+    # If already connected, we're good (no lock needed on the hot path)
+    if _get_driver_client(port).is_connected:
+        return True
+
+    async with _connect_locks.setdefault(port, asyncio.Lock()):
+        return await _reconnect_driver(trace, port)
+
+
+async def _reconnect_driver(trace: TraceContext, port: int) -> bool:
+    """Reconnect or rediscover the driver for port; caller holds its connect lock."""
     client = _get_driver_client(port)
 
-    # If already connected, we're good
+    # Another call may have connected while we waited for the lock
     if client.is_connected:
         return True
 
     # Try to reconnect with existing URI
-    if client._uri:
+    if client.uri:
         trace.log("DRIVER_RECONNECT", "Attempting reconnect with existing URI")
         if await client.connect(trace):
             return True
         trace.log("DRIVER_RECONNECT_FAIL", "Reconnect failed, will rediscover")
+        # The app likely restarted, so any cached URI/forward is stale too
+        _invalidate_uri_cache()
+        _invalidate_forward_cache()
 
     # Rediscover VM service URI
     trace.log("DRIVER_REDISCOVER", "Discovering fresh VM service URI")
-    uri = await _discover_vm_service_uri(trace)
-    if not uri:
-        trace.log("DRIVER_ERR", "No VM service URI found during rediscovery")
+    client = await _build_forwarded_driver(trace, port)
+    if client is None:
         return False
 
-    # Extract port and set up forwarding
-    import re
-    port_match = re.search(r":(\d+)/", uri)
-    if not port_match:
-        trace.log("DRIVER_ERR", f"Could not parse port from URI: {uri}")
-        return False
+    _set_driver_client(port, client)
+    return True
 
-    device_port = int(port_match.group(1))
-    if not await _forward_vm_service_port(trace, device_port, port):
-        trace.log("DRIVER_ERR", f"Failed to forward port {device_port}")
-        return False
 
-    # Create new client with fresh URI
-    forwarded_uri = uri.replace(f"127.0.0.1:{device_port}", f"localhost:{port}")
-    from ..driver import FlutterDriverClient
-    _driver_client = FlutterDriverClient(port=port, uri=forwarded_uri)
-    _unified_executor = None  # Reset executor to pick up new client
+_DEFAULT_SDK_ADB = str(Path.home() / "Library/Android/sdk/platform-tools/adb")
 
-    if await _driver_client.connect(trace):
-        trace.log("DRIVER_RECONNECTED", f"Connected with fresh URI: {forwarded_uri}")
-        return True
-
-    trace.log("DRIVER_ERR", "Failed to connect with fresh URI")
-    return False
 
+@functools.cache
 def _find_adb() -> Optional[str]:
-    """Find ADB binary."""
-    paths = [
-        shutil.which("adb"),
-        str(Path.home() / "Library/Android/sdk/platform-tools/adb"),
-        "/usr/local/bin/adb",
-    ]
-    for path in paths:
-        if path and Path(path).exists():
+    """Find ADB binary (memoized; call _find_adb.cache_clear() to re-probe)."""
+    for path in (shutil.which("adb"), _DEFAULT_SDK_ADB, "/usr/local/bin/adb"):
+        if not path:
+            continue
+        try:
+            os.stat(path)
             return path
+        except OSError:
+            continue
     return None
 
-_adb_path = _find_adb()
 
+@functools.cache
+def _find_flutter() -> Optional[str]:
+    """Find the flutter binary on PATH (memoized; call _find_flutter.cache_clear() to re-probe)."""
+    return shutil.which("flutter")
 
-async def _discover_vm_service_uri(trace: TraceContext, device: Optional[str] = None) -> Optional[str]:
-    """Discover VM service URI.
 
-    For Android: Uses logcat first (mDNS caches stale entries on macOS)
-    For iOS: Uses mDNS (reliable for local simulators)
+def _get_adb_path() -> Optional[str]:
+    """ADB path, resolved on first use rather than at import."""
+    return _find_adb()
+
+
+@functools.lru_cache(maxsize=64)
+def _adb_device_args(device: Optional[str]) -> Tuple[str, ...]:
+    """`-s device` selector, built once per device."""
+    return ("-s", device) if device else ()
+
+
+def _adb_argv(device: Optional[str]) -> Tuple[str, ...]:
+    """`adb [-s device]` argv prefix.
+
+    The adb path is looked up per call (it's memoized by _find_adb) so that
+    _find_adb.cache_clear() takes effect here too.
     """
-    import os
-    import re
-
-    def _extract_uri(output: str) -> Optional[str]:
-        """Extract VM service URI from log output."""
-        for line in reversed(output.split("\n")):
-            if "Dart VM service is listening on" in line or "Observatory listening on" in line:
-                match = re.search(r"http://[^\s]+", line)
-                if match:
-                    return match.group(0)
-        return None
+    return (_get_adb_path(), *_adb_device_args(device))
 
-    # Detect platform from server port (9226/9227=iOS, 9225=Android) or device UDID
-    server_port = int(os.getenv("FLUTTER_CONTROL_PORT", "9225"))
-    is_ios_server = server_port in (9226, 9227)
-    is_ios_udid = device and len(device) == 36 and device.count("-") == 4
-    is_ios = is_ios_server or is_ios_udid
 
-    # For Android: Use logcat FIRST (mDNS on macOS caches stale entries)
-    # Use -s flutter:I to filter only flutter logs (avoids buffer overflow with *:I)
-    if not is_ios and _adb_path:
-        trace.log("DISCOVER_LOGCAT", "Using logcat for Android")
-        try:
-            cmd = [_adb_path]
-            if device:
-                cmd.extend(["-s", device])
-            cmd.extend(["logcat", "-d", "-s", "flutter:I"])
+def _extract_vm_service_uri(output: bytes) -> Optional[str]:
+    """Extract VM service URI from log output (most recent line wins).
 
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
-            output = stdout.decode("utf-8", errors="replace")
+    Scans the raw bytes backwards for the listening banner and decodes only
+    the matching line, rather than decoding and splitting the whole buffer.
+    """
+    end = len(output)
+    while True:
+        idx = max(output.rfind(marker, 0, end) for marker in _VM_SERVICE_MARKERS)
+        if idx == -1:
+            return None
+        line_end = output.find(b"\n", idx)
+        match = _HTTP_URI_BYTES_RE.search(output, idx, line_end if line_end != -1 else len(output))
+        if match:
+            return match.group(0).decode("utf-8", errors="replace")
+        end = idx
+
+
+async def _stop_process(process) -> None:
+    """Terminate a long-running subprocess, killing it if it doesn't exit."""
+    process.terminate()
+    try:
+        async with asyncio.timeout(1):
+            await process.wait()
+    except asyncio.TimeoutError:
+        process.kill()
 
-            uri = _extract_uri(output)
-            if uri:
-                trace.log("DISCOVER_URI", f"logcat: {uri}")
-                return uri
-            trace.log("DISCOVER_LOGCAT_EMPTY", "No VM service URI in logcat")
+
+_LOGCAT_VM_SERVICE_CMD = (
+    "logcat -d -s flutter:I"
+    " | grep -E 'Dart VM service is listening on|Observatory listening on' | tail -n 1"
+)
+
+
+async def _discover_via_logcat(trace: TraceContext, device: Optional[str] = None) -> Optional[str]:
+    """Find the VM service URI in the Android flutter logcat buffer."""
+    trace.log("DISCOVER_LOGCAT", "Using logcat for Android")
+    try:
+        # Use -s flutter:I to filter only flutter logs (avoids buffer overflow with *:I),
+        # and let the device grep out the last banner line so only that crosses adb
+        _, stdout = await get_adb_shell(_get_adb_path(), device).exec(_LOGCAT_VM_SERVICE_CMD, timeout=10)
+        uri = _extract_vm_service_uri(stdout)
+        if uri:
+            trace.log("DISCOVER_URI", f"logcat: {uri}")
+            return uri
+        trace.log("DISCOVER_LOGCAT_EMPTY", "No VM service URI in logcat")
+    except Exception as e:
+        trace.log("DISCOVER_LOGCAT_ERR", str(e))
+    return None
+
+
+_DART_VM_SERVICE_TYPE = "_dartVmService._tcp.local."
+
+
+async def _discover_via_mdns(trace: TraceContext) -> Optional[str]:
+    """Find the VM service URI via Bonjour (auth code is in the TXT record).
+
+    Uses the in-process zeroconf browser when installed, otherwise the
+    dns-sd CLI. A zeroconf error (not a miss) falls back to dns-sd.
+    """
+    if AsyncZeroconf is not None:
+        try:
+            return await _discover_via_zeroconf(trace)
         except Exception as e:
-            trace.log("DISCOVER_LOGCAT_ERR", str(e))
+            trace.log("MDNS_ZEROCONF_ERR", f"{e}, falling back to dns-sd")
+    return await _discover_via_dns_sd(trace)
+
+
+async def _discover_via_zeroconf(trace: TraceContext, timeout: float = 2.0) -> Optional[str]:
+    """Browse for the Dart VM service with zeroconf (no dns-sd subprocesses)."""
+    loop = asyncio.get_running_loop()
+    found: asyncio.Future = loop.create_future()
 
-    # For iOS (or Android fallback): Try mDNS
-    # The VM service advertises via Bonjour with the auth code in TXT record
+    def _on_change(zeroconf, service_type, name, state_change):
+        if state_change is ServiceStateChange.Added:
+            loop.call_soon_threadsafe(lambda: found.done() or found.set_result(name))
+
+    aiozc = AsyncZeroconf()
+    browser = AsyncServiceBrowser(aiozc.zeroconf, [_DART_VM_SERVICE_TYPE], handlers=[_on_change])
+    try:
+        try:
+            async with asyncio.timeout(timeout):
+                name = await found
+        except asyncio.TimeoutError:
+            trace.log("MDNS_NOT_FOUND", "No Dart VM service advertised via mDNS")
+            return None
+
+        trace.log("MDNS_FOUND", f"Service: {name}")
+        info = await aiozc.async_get_service_info(_DART_VM_SERVICE_TYPE, name, timeout=int(timeout * 1000))
+        if info is None or not info.port:
+            trace.log("MDNS_NOT_FOUND", f"No port resolved for {name}")
+            return None
+
+        auth_code = info.properties.get(b"authCode")
+        if auth_code:
+            uri = f"http://127.0.0.1:{info.port}/{auth_code.decode()}/"
+            trace.log("DISCOVER_URI", f"mDNS: {uri}")
+        else:
+            uri = f"http://127.0.0.1:{info.port}/"
+            trace.log("DISCOVER_URI", f"mDNS (no auth): {uri}")
+        return uri
+    finally:
+        await browser.async_cancel()
+        await aiozc.async_close()
+
+
+async def _discover_via_dns_sd(trace: TraceContext) -> Optional[str]:
+    """Browse for the Dart VM service by driving the dns-sd CLI."""
     try:
         # Step 1: Browse for _dartVmService._tcp services
         # dns-sd runs continuously, so we read lines until we find what we need
         process = await asyncio.create_subprocess_exec(
             "dns-sd", "-B", "_dartVmService._tcp", "local.",
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
 
         service_name = None
         try:
             # Read lines until we find a service or timeout
-            start_time = asyncio.get_event_loop().time()
-            while asyncio.get_event_loop().time() - start_time < 2:
-                try:
-                    line = await asyncio.wait_for(process.stdout.readline(), timeout=0.5)
-                    if line:
-                        decoded = line.decode()
-                        if "_dartVmService._tcp." in decoded and "Add" in decoded:
-                            parts = decoded.split()
-                            if len(parts) >= 7:
-                                service_name = parts[-1]
-                                break
-                except asyncio.TimeoutError:
-                    continue
+            async with asyncio.timeout(2):
+                async for line in process.stdout:
+                    decoded = line.decode()
+                    if "_dartVmService._tcp." in decoded and "Add" in decoded:
+                        parts = decoded.split()
+                        if len(parts) >= 7:
+                            service_name = parts[-1]
+                            break
+        except TimeoutError:
+            pass
         finally:
-            process.terminate()
-            try:
-                await asyncio.wait_for(process.wait(), timeout=1)
-            except asyncio.TimeoutError:
-                process.kill()
+            # Shielded so dns-sd is reaped even if discovery is cancelled
+            await asyncio.shield(_stop_process(process))
 
         if service_name:
             trace.log("MDNS_FOUND", f"Service: {service_name}")
@@ -223,37 +402,30 @@ async def _discover_vm_service_uri(trace: TraceContext, device: Optional[str] =
             process = await asyncio.create_subprocess_exec(
                 "dns-sd", "-L", service_name, "_dartVmService._tcp", "local.",
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
 
             port = None
             auth_code = None
             try:
-                start_time = asyncio.get_event_loop().time()
-                while asyncio.get_event_loop().time() - start_time < 2:
-                    try:
-                        line = await asyncio.wait_for(process.stdout.readline(), timeout=0.5)
-                        if line:
-                            decoded = line.decode()
-                            # Port: "can be reached at hostname:PORT"
-                            port_match = re.search(r":(\d+)\s", decoded)
-                            if port_match:
-                                port = port_match.group(1)
-                            # Auth code: "authCode=XXXXX"
-                            auth_match = re.search(r"authCode=(\S+)", decoded)
-                            if auth_match:
-                                auth_code = auth_match.group(1)
-                            # Once we have both, we're done
-                            if port and auth_code:
-                                break
-                    except asyncio.TimeoutError:
-                        continue
+                async with asyncio.timeout(2):
+                    async for line in process.stdout:
+                        decoded = line.decode()
+                        # Port: "can be reached at hostname:PORT"
+                        port_match = _MDNS_PORT_RE.search(decoded)
+                        if port_match:
+                            port = port_match.group(1)
+                        # Auth code: "authCode=XXXXX"
+                        auth_match = _AUTH_CODE_RE.search(decoded)
+                        if auth_match:
+                            auth_code = auth_match.group(1)
+                        # Once we have both, we're done
+                        if port and auth_code:
+                            break
+            except TimeoutError:
+                pass
             finally:
-                process.terminate()
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=1)
-                except asyncio.TimeoutError:
-                    process.kill()
+                await asyncio.shield(_stop_process(process))
 
             if port and auth_code:
                 uri = f"http://127.0.0.1:{port}/{auth_code}/"
@@ -267,22 +439,88 @@ async def _discover_vm_service_uri(trace: TraceContext, device: Optional[str] =
         trace.log("MDNS_NOT_FOUND", "No Dart VM service advertised via mDNS")
     except Exception as e:
         trace.log("MDNS_ERR", str(e))
+    return None
 
-    # Last resort for iOS: port scan (finds port but not auth code)
-    if is_ios:
+
+# Discovered VM service URIs keyed by (device, is_ios) -> (monotonic timestamp, uri).
+# Saves re-spawning dns-sd/adb when the driver reconnects repeatedly.
+_VM_URI_CACHE_TTL = 30.0
+_uri_cache: Dict[tuple, tuple] = {}
+
+
+def _invalidate_uri_cache(device: Optional[str] = None) -> None:
+    """Drop cached VM service URIs for a device (after a failed connect)."""
+    _uri_cache.pop((device, False), None)
+    _uri_cache.pop((device, True), None)
+
+
+async def _discover_vm_service_uri(trace: TraceContext, device: Optional[str] = None, use_cache: bool = True) -> Optional[str]:
+    """Discover VM service URI.
+
+    For Android: Uses logcat first (mDNS caches stale entries on macOS)
+    For iOS: Uses mDNS (reliable for local simulators)
+
+    The mDNS lookup is started up front and runs while logcat is read, so
+    the Android fallback path doesn't pay for both lookups back to back.
+    Successful results are cached for _VM_URI_CACHE_TTL seconds; pass
+    use_cache=False to force a fresh lookup.
+    """
+    # Detect platform from server port or device UDID
+    is_ios = _IS_IOS_SERVER or _is_ios_udid(device)
+
+    key = (device, is_ios)
+    if use_cache:
+        cached = _uri_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _VM_URI_CACHE_TTL:
+            trace.log("DISCOVER_CACHED", cached[1])
+            return cached[1]
+
+    uri = await _discover_vm_service_uri_uncached(trace, device, is_ios)
+    if uri:
+        _uri_cache[key] = (time.monotonic(), uri)
+    return uri
+
+
+async def _discover_vm_service_uri_uncached(trace: TraceContext, device: Optional[str], is_ios: bool) -> Optional[str]:
+    """Run logcat / mDNS / port-scan discovery without consulting the cache."""
+    mdns_task = asyncio.create_task(_discover_via_mdns(trace))
+    try:
+        # For Android: logcat result wins over mDNS (mDNS on macOS caches stale entries)
+        if not is_ios and _get_adb_path():
+            uri = await _discover_via_logcat(trace, device)
+            if uri:
+                return uri
+
+        # For iOS (or Android fallback): mDNS
+        uri = await mdns_task
+        if uri:
+            return uri
+    finally:
+        if not mdns_task.done():
+            mdns_task.cancel()
+            try:
+                await mdns_task
+            except asyncio.CancelledError:
+                pass
+
+    # Last resort for iOS: port scan (finds port but not auth code).
+    # Simulators only run on macOS, so there's nothing to scan elsewhere.
+    if is_ios and sys.platform == "darwin":
         trace.log("DISCOVER_FALLBACK", "Trying iOS port scan")
         try:
-            process = await asyncio.create_subprocess_shell(
-                "/usr/sbin/lsof -i -P -n | grep -E '^Runner.*LISTEN'",
+            # Run lsof directly and filter here rather than via sh + grep
+            process = await asyncio.create_subprocess_exec(
+                "/usr/sbin/lsof", "-i", "-P", "-n",
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=5)
-            output = stdout.decode()
+            async with asyncio.timeout(5):
+                stdout, _ = await process.communicate()
+            output = stdout.decode("utf-8", errors="replace")
 
-            for line in output.split("\n"):
-                if "127.0.0.1:" in line:
-                    match = re.search(r"127\.0\.0\.1:(\d+)", line)
+            for line in output.splitlines():
+                if line.startswith("Runner") and "LISTEN" in line and "127.0.0.1:" in line:
+                    match = _LSOF_PORT_RE.search(line)
                     if match:
                         port = match.group(1)
                         uri = f"http://127.0.0.1:{port}/"
@@ -294,24 +532,68 @@ async def _discover_vm_service_uri(trace: TraceContext, device: Optional[str] =
     return None
 
 
+# Known adb forwards: host_port -> (device serial, device_port).
+# Seeded from `adb forward --list` on first use so existing forwards are reused.
+_forward_cache: Dict[int, tuple] = {}
+_forward_cache_loaded = False
+
+
+def _invalidate_forward_cache() -> None:
+    """Forget known forwards (after a failed connect) so the next call re-checks adb."""
+    global _forward_cache_loaded
+    _forward_cache.clear()
+    _forward_cache_loaded = False
+
+
+async def _load_forward_cache(trace: TraceContext) -> None:
+    """Populate _forward_cache from `adb forward --list`."""
+    global _forward_cache_loaded
+    _forward_cache_loaded = True
+    try:
+        process = await asyncio.create_subprocess_exec(
+            _get_adb_path(), "forward", "--list",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        async with asyncio.timeout(10):
+            stdout, _ = await process.communicate()
+    except Exception as e:
+        trace.log("FORWARD_LIST_ERR", str(e))
+        return
+
+    # Lines look like: "emulator-5554 tcp:9223 tcp:42291"
+    for line in stdout.decode("utf-8", errors="replace").splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[1].startswith("tcp:") and parts[2].startswith("tcp:"):
+            try:
+                _forward_cache[int(parts[1][4:])] = (parts[0], int(parts[2][4:]))
+            except ValueError:
+                continue
+
+
 async def _forward_vm_service_port(trace: TraceContext, device_port: int, host_port: int = 9223, device: Optional[str] = None, is_ios: bool = False) -> bool:
     """Forward VM service port from device to host.
 
     For iOS simulator, no forwarding is needed (returns True immediately).
-    For Android, uses adb forward.
+    For Android, uses adb forward, skipping it when the same mapping is
+    already in place.
     """
     # iOS simulator runs on same machine - no port forwarding needed
     if is_ios:
         trace.log("FORWARD_SKIP", "iOS simulator - no forwarding needed")
         return True
 
-    if not _adb_path:
+    if not _get_adb_path():
         return False
 
-    cmd = [_adb_path]
-    if device:
-        cmd.extend(["-s", device])
-    cmd.extend(["forward", f"tcp:{host_port}", f"tcp:{device_port}"])
+    if not _forward_cache_loaded:
+        await _load_forward_cache(trace)
+    existing = _forward_cache.get(host_port)
+    if existing and existing[1] == device_port and (device is None or existing[0] == device):
+        trace.log("FORWARD_CACHED", f"localhost:{host_port} -> device:{device_port}")
+        return True
+
+    cmd = [*_adb_argv(device), "forward", f"tcp:{host_port}", f"tcp:{device_port}"]
 
     try:
         process = await asyncio.create_subprocess_exec(
@@ -319,11 +601,13 @@ async def _forward_vm_service_port(trace: TraceContext, device_port: int, host_p
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+        async with asyncio.timeout(10):
+            _, stderr = await process.communicate()
         if process.returncode == 0:
             trace.log("FORWARD_OK", f"localhost:{host_port} -> device:{device_port}")
+            _forward_cache[host_port] = (device, device_port)
             return True
-        trace.log("FORWARD_ERR", stderr.decode())
+        trace.log("FORWARD_ERR", stderr.decode("utf-8", errors="replace"))
         return False
     except Exception as e:
         trace.log("FORWARD_ERR", str(e))
@@ -332,7 +616,6 @@ async def _forward_vm_service_port(trace: TraceContext, device_port: int, host_p
 
 def _get_screenshot_path(trace_id: str, platform: str) -> Path:
     """Get path for saving screenshot."""
-    from datetime import datetime
     log_dir = Path.home() / "Library" / "Logs" / "flutter-control" / "screenshots"
     log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -340,14 +623,34 @@ def _get_screenshot_path(trace_id: str, platform: str) -> Path:
 
 
 async def _adb_screenshot(trace: TraceContext, device: Optional[str] = None) -> Dict[str, Any]:
-    """Take screenshot using ADB screencap."""
-    if not _adb_path:
+    """Take screenshot using ADB screencap.
+
+    Reads the PNG straight from the adb server socket; if that fails, runs
+    screencap through the device's persistent adb shell session, and only
+    then falls back to a one-off `adb exec-out`.
+    """
+    if not _get_adb_path():
         return {"success": False, "error": "ADB not found"}
 
-    cmd = [_adb_path]
-    if device:
-        cmd.extend(["-s", device])
-    cmd.extend(["exec-out", "screencap", "-p"])
+    trace.log("ADB_RAW", "exec:screencap -p")
+    try:
+        png = await adb_exec_raw(device, "screencap -p", timeout=10)
+        if len(png) >= 100:
+            return _save_adb_screenshot(trace, png)
+        trace.log("ADB_RAW_ERR", f"screencap returned {len(png)} bytes")
+    except AdbShellError as e:
+        trace.log("ADB_RAW_ERR", str(e))
+
+    trace.log("ADB_SHELL", "screencap -p")
+    try:
+        exit_code, png = await get_adb_shell(_get_adb_path(), device).exec("screencap -p", timeout=10)
+        if exit_code == 0 and len(png) >= 100:
+            return _save_adb_screenshot(trace, png)
+        trace.log("ADB_SHELL_ERR", f"screencap exit={exit_code} bytes={len(png)}")
+    except AdbShellError as e:
+        trace.log("ADB_SHELL_ERR", str(e))
+
+    cmd = [*_adb_argv(device), "exec-out", "screencap", "-p"]
 
     trace.log("ADB_CMD", " ".join(cmd))
 
@@ -357,7 +660,8 @@ async def _adb_screenshot(trace: TraceContext, device: Optional[str] = None) ->
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+        async with asyncio.timeout(10):
+            stdout, stderr = await process.communicate()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -369,18 +673,7 @@ async def _adb_screenshot(trace: TraceContext, device: Optional[str] = None) ->
             trace.log("ADB_ERR", "Empty or invalid screenshot")
             return {"success": False, "error": "Empty screenshot"}
 
-        # Save to file instead of returning base64
-        screenshot_path = _get_screenshot_path(trace.trace_id, "android")
-        screenshot_path.write_bytes(stdout)
-        trace.log("ADB_OK", f"{len(stdout)} bytes -> {screenshot_path}")
-
-        return {
-            "success": True,
-            "error": None,
-            "path": str(screenshot_path),
-            "size_bytes": len(stdout),
-            "format": "png",
-        }
+        return _save_adb_screenshot(trace, stdout)
     except asyncio.TimeoutError:
         trace.log("ADB_ERR", "Timeout")
         return {"success": False, "error": "ADB timeout"}
@@ -389,26 +682,80 @@ async def _adb_screenshot(trace: TraceContext, device: Optional[str] = None) ->
         return {"success": False, "error": str(e)}
 
 
+# Base64 chars decoded per write; a multiple of 4 so no slice splits a quantum
+_B64_CHUNK = 64 * 1024
+
+
+def _write_base64_file(data_b64: str, path: Path) -> int:
+    """Decode base64 into a file slice by slice, returning the byte count.
+
+    Avoids holding the whole decoded image in memory next to the base64 text.
+    """
+    if "\n" in data_b64:
+        # Line-wrapped base64 would misalign the fixed-size slices
+        data_b64 = "".join(data_b64.split())
+    size = 0
+    with open(path, "wb") as f:
+        for start in range(0, len(data_b64), _B64_CHUNK):
+            chunk = base64.b64decode(data_b64[start:start + _B64_CHUNK])
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def _maestro_screenshot_response(trace: TraceContext, result: MaestroResult) -> Dict[str, Any]:
+    """Save a Maestro screenshot under the screenshots dir and build the tool response."""
+    response = {"success": result.success, "error": result.error_message, "method": "maestro"}
+    if result.screenshot_file or result.screenshot_base64:
+        screenshot_path = _get_screenshot_path(trace.trace_id, f"{_PLATFORM_STR}_maestro")
+        if result.screenshot_file:
+            # Legacy flows already wrote the PNG; move it rather than round-trip through base64
+            shutil.move(result.screenshot_file, screenshot_path)
+            size = screenshot_path.stat().st_size
+        else:
+            size = _write_base64_file(result.screenshot_base64, screenshot_path)
+        response["path"] = str(screenshot_path)
+        response["size_bytes"] = size
+        response["format"] = "png"
+    return response
+
+
+def _save_adb_screenshot(trace: TraceContext, png: bytes) -> Dict[str, Any]:
+    """Write raw screencap PNG bytes to the screenshots dir."""
+    # Save to file instead of returning base64
+    screenshot_path = _get_screenshot_path(trace.trace_id, "android")
+    screenshot_path.write_bytes(png)
+    trace.log("ADB_OK", f"{len(png)} bytes -> {screenshot_path}")
+
+    return {
+        "success": True,
+        "error": None,
+        "path": str(screenshot_path),
+        "size_bytes": len(png),
+        "format": "png",
+    }
+
+
 async def _simctl_screenshot(trace: TraceContext, device: Optional[str] = None) -> Dict[str, Any]:
     """Take screenshot using xcrun simctl (iOS simulator)."""
-    import os
-
     # Use booted device if not specified
     device_arg = device or "booted"
 
-    # Save directly to final location
+    # Save directly to final location (no temp file or read-back)
     screenshot_path = _get_screenshot_path(trace.trace_id, "ios")
 
     try:
-        cmd = ["xcrun", "simctl", "io", device_arg, "screenshot", str(screenshot_path)]
+        cmd = ["xcrun", "simctl", "io", device_arg, "screenshot", "--type=png", str(screenshot_path)]
         trace.log("SIMCTL_CMD", " ".join(cmd))
 
+        # Only the status chatter goes to stdout; don't buffer it
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
         )
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+        async with asyncio.timeout(10):
+            _, stderr = await process.communicate()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -448,7 +795,7 @@ async def _flutter_run(
     timeout: int,
 ) -> Dict[str, Any]:
     """Run Flutter app with Observatory enabled."""
-    flutter_path = shutil.which("flutter")
+    flutter_path = _find_flutter()
     if not flutter_path:
         return {"success": False, "error": "Flutter not found in PATH"}
 
@@ -474,30 +821,25 @@ async def _flutter_run(
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            # Scan stderr along with stdout; an unread stderr pipe could fill and stall flutter
+            stderr=asyncio.subprocess.STDOUT,
             cwd=str(project),
         )
 
         # Wait for Observatory to be ready (look for "Observatory" or "VM Service" in output)
-        import re as re_module
-        start_time = asyncio.get_event_loop().time()
         output_lines = []
-
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            try:
-                line = await asyncio.wait_for(
-                    process.stdout.readline(),  # type: ignore
-                    timeout=1.0,
-                )
-                if line:
+        try:
+            async with asyncio.timeout(timeout):
+                async for line in process.stdout:  # type: ignore
                     decoded = line.decode("utf-8", errors="replace").strip()
                     output_lines.append(decoded)
                     trace.log("FLUTTER_OUT", decoded)
+                    lowered = decoded.lower()
 
                     # Check for Observatory URL (extract full URI with auth token)
-                    if "vm service" in decoded.lower() or "observatory" in decoded.lower():
+                    if "vm service" in lowered or "observatory" in lowered:
                         # Extract full URI: http://127.0.0.1:PORT/AUTH_TOKEN=/
-                        uri_match = re_module.search(r"http://[^\s]+", decoded)
+                        uri_match = _HTTP_URI_RE.search(decoded)
                         if uri_match:
                             observatory_uri = uri_match.group(0)
                             trace.log("FLUTTER_READY", f"Observatory at {observatory_uri}")
@@ -510,19 +852,25 @@ async def _flutter_run(
                             }
 
                     # Check for errors
-                    if "error" in decoded.lower() and "failed" in decoded.lower():
+                    if "error" in lowered and "failed" in lowered:
                         trace.log("FLUTTER_ERR", decoded)
                         process.terminate()
                         return {"success": False, "error": decoded}
-            except asyncio.TimeoutError:
-                continue
-
-        # Timeout waiting for Observatory
-        process.terminate()
-        trace.log("FLUTTER_ERR", "Timeout waiting for Observatory")
+        except TimeoutError:
+            # Timeout waiting for Observatory
+            process.terminate()
+            trace.log("FLUTTER_ERR", "Timeout waiting for Observatory")
+            return {
+                "success": False,
+                "error": "Timeout waiting for Observatory to start",
+                "output": output_lines[-10:] if output_lines else [],
+            }
+
+        # stdout closed before the VM service came up
+        trace.log("FLUTTER_ERR", "flutter run exited before Observatory started")
         return {
             "success": False,
-            "error": "Timeout waiting for Observatory to start",
+            "error": "flutter run exited before Observatory started",
             "output": output_lines[-10:] if output_lines else [],
         }
 
@@ -531,25 +879,53 @@ async def _flutter_run(
         return {"success": False, "error": str(e)}
 
 
-async def _ios_list_devices(trace: TraceContext) -> Dict[str, Any]:
-    """List iOS simulators using xcrun simctl."""
-    import json as json_module
+class SimctlError(Exception):
+    """`xcrun simctl` exited with an error."""
 
-    try:
-        process = await asyncio.create_subprocess_exec(
-            "xcrun", "simctl", "list", "devices", "-j",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
 
-        if process.returncode != 0:
-            error = stderr.decode("utf-8", errors="replace")
-            trace.log("SIMCTL_ERR", error)
-            return {"success": False, "error": f"simctl failed: {error}"}
+# Last `simctl list devices -j` result: (monotonic timestamp, {runtime: [device, ...]})
+_SIMCTL_LIST_TTL = 1.0
+_simctl_list_cache: Optional[tuple] = None
+
+
+def _invalidate_simctl_list_cache() -> None:
+    """Forget the cached simulator list (after boot/shutdown changes state)."""
+    global _simctl_list_cache
+    _simctl_list_cache = None
+
+
+async def _simctl_list_devices(trace: TraceContext) -> Dict[str, Any]:
+    """Return simctl's devices-by-runtime map, reusing a result up to 1s old.
+
+    Raises SimctlError if simctl fails, asyncio.TimeoutError on timeout.
+    """
+    global _simctl_list_cache
+
+    if _simctl_list_cache and time.monotonic() - _simctl_list_cache[0] < _SIMCTL_LIST_TTL:
+        return _simctl_list_cache[1]
+
+    process = await asyncio.create_subprocess_exec(
+        "xcrun", "simctl", "list", "devices", "-j",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    async with asyncio.timeout(30):
+        stdout, stderr = await process.communicate()
+
+    if process.returncode != 0:
+        error = stderr.decode("utf-8", errors="replace")
+        trace.log("SIMCTL_ERR", error)
+        raise SimctlError(f"simctl failed: {error}")
+
+    devices = orjson.loads(stdout).get("devices", {})
+    _simctl_list_cache = (time.monotonic(), devices)
+    return devices
 
-        data = json_module.loads(stdout.decode("utf-8"))
-        devices = data.get("devices", {})
+
+async def _ios_list_devices(trace: TraceContext) -> Dict[str, Any]:
+    """List iOS simulators using xcrun simctl."""
+    try:
+        devices = await _simctl_list_devices(trace)
 
         # Find booted devices
         booted = []
@@ -574,6 +950,8 @@ async def _ios_list_devices(trace: TraceContext) -> Dict[str, Any]:
             "available": available,
             "output": f"{len(booted)} booted, {len(available)} available simulators",
         }
+    except SimctlError as e:
+        return {"success": False, "error": str(e)}
     except asyncio.TimeoutError:
         trace.log("SIMCTL_ERR", "Timeout")
         return {"success": False, "error": "simctl timeout"}
@@ -586,51 +964,37 @@ async def _ios_start_simulator(
     trace: TraceContext, device_name: Optional[str] = None, udid: Optional[str] = None, headless: Optional[bool] = None
 ) -> Dict[str, Any]:
     """Start an iOS simulator by name or UDID."""
-    import json as json_module
-    from ..config import HEADLESS_DEFAULT
-
     # Determine headless mode
     if headless is None:
         headless = HEADLESS_DEFAULT
 
-    # If no UDID provided, find it by name
-    if not udid and device_name:
-        try:
-            process = await asyncio.create_subprocess_exec(
-                "xcrun", "simctl", "list", "devices", "-j",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
-            data = json_module.loads(stdout.decode("utf-8"))
-
-            for _runtime, device_list in data.get("devices", {}).items():
-                for device in device_list:
-                    if device["name"] == device_name and device.get("isAvailable", False):
-                        udid = device["udid"]
-                        break
-                if udid:
-                    break
+    if not udid and not device_name:
+        return {"success": False, "error": "No device_name or udid provided"}
 
-            if not udid:
-                return {"success": False, "error": f"Simulator not found: {device_name}"}
-        except Exception as e:
+    # One simctl listing serves both the name lookup and the booted check
+    devices = None
+    try:
+        devices = await _simctl_list_devices(trace)
+    except Exception as e:
+        if not udid:
             return {"success": False, "error": f"Failed to find simulator: {e}"}
 
+    # If no UDID provided, find it by name
     if not udid:
-        return {"success": False, "error": "No device_name or udid provided"}
+        for _runtime, device_list in devices.items():
+            for device in device_list:
+                if device["name"] == device_name and device.get("isAvailable", False):
+                    udid = device["udid"]
+                    break
+            if udid:
+                break
+
+        if not udid:
+            return {"success": False, "error": f"Simulator not found: {device_name}"}
 
     # Check if already booted
     try:
-        process = await asyncio.create_subprocess_exec(
-            "xcrun", "simctl", "list", "devices", "-j",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
-        data = json_module.loads(stdout.decode("utf-8"))
-
-        for _runtime, device_list in data.get("devices", {}).items():
+        for _runtime, device_list in (devices or {}).items():
             for device in device_list:
                 if device["udid"] == udid and device["state"] == "Booted":
                     trace.log("SIMCTL_BOOT", f"Already booted: {udid}")
@@ -654,7 +1018,9 @@ async def _ios_start_simulator(
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=120)
+        async with asyncio.timeout(120):
+            _, stderr = await process.communicate()
+        _invalidate_simctl_list_cache()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -689,20 +1055,12 @@ async def _ios_start_simulator(
 
 async def _ios_stop_simulator(trace: TraceContext, udid: Optional[str] = None) -> Dict[str, Any]:
     """Stop an iOS simulator."""
-    import json as json_module
-
     # If no UDID, find the first booted simulator
     if not udid:
         try:
-            process = await asyncio.create_subprocess_exec(
-                "xcrun", "simctl", "list", "devices", "-j",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
-            data = json_module.loads(stdout.decode("utf-8"))
+            devices = await _simctl_list_devices(trace)
 
-            for _runtime, device_list in data.get("devices", {}).items():
+            for _runtime, device_list in devices.items():
                 for device in device_list:
                     if device["state"] == "Booted":
                         udid = device["udid"]
@@ -722,7 +1080,9 @@ async def _ios_stop_simulator(trace: TraceContext, udid: Optional[str] = None) -
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=60)
+        async with asyncio.timeout(60):
+            _, stderr = await process.communicate()
+        _invalidate_simctl_list_cache()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -738,19 +1098,36 @@ async def _ios_stop_simulator(trace: TraceContext, udid: Optional[str] = None) -
         return {"success": False, "error": str(e)}
 
 
+# Last successful android_list_devices result: (monotonic timestamp, result)
+_ANDROID_LIST_TTL = 1.0
+_android_list_cache: Optional[tuple] = None
+
+
+def _invalidate_android_list_cache() -> None:
+    """Forget the cached device/AVD list (an emulator start/stop changes state)."""
+    global _android_list_cache
+    _android_list_cache = None
+
+
 async def _android_list_devices(trace: TraceContext) -> Dict[str, Any]:
-    """List Android devices and AVDs using adb and emulator commands."""
-    if not _adb_path:
+    """List Android devices and AVDs using adb and emulator commands (cached briefly)."""
+    global _android_list_cache
+    if _android_list_cache and time.monotonic() - _android_list_cache[0] < _ANDROID_LIST_TTL:
+        trace.log("ADB_CACHED", _android_list_cache[1]["output"])
+        return _android_list_cache[1]
+
+    if not _get_adb_path():
         return {"success": False, "error": "ADB not found"}
 
     try:
         # Get connected devices
         process = await asyncio.create_subprocess_exec(
-            _adb_path, "devices", "-l",
+            _get_adb_path(), "devices", "-l",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+        async with asyncio.timeout(10):
+            stdout, stderr = await process.communicate()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -787,22 +1164,25 @@ async def _android_list_devices(trace: TraceContext) -> Dict[str, Any]:
             process = await asyncio.create_subprocess_exec(
                 emulator_path, "-list-avds",
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
             )
-            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+            async with asyncio.timeout(10):
+                stdout, _ = await process.communicate()
             avd_list = stdout.decode("utf-8").strip().split("\n")
             avds = [avd.strip() for avd in avd_list if avd.strip()]
 
         running = [d for d in devices if d["state"] == "device"]
         trace.log("ADB_OK", f"{len(running)} running, {len(avds)} AVDs available")
 
-        return {
+        result = {
             "success": True,
             "devices": devices,
             "running": running,
             "avds": avds,
             "output": f"{len(running)} devices running, {len(avds)} AVDs available",
         }
+        _android_list_cache = (time.monotonic(), result)
+        return result
     except asyncio.TimeoutError:
         trace.log("ADB_ERR", "Timeout")
         return {"success": False, "error": "adb timeout"}
@@ -813,15 +1193,16 @@ async def _android_list_devices(trace: TraceContext) -> Dict[str, Any]:
 
 async def _setup_maestro_forwarding(trace: TraceContext, device_id: str) -> bool:
     """Set up port forwarding for Maestro driver (port 7001)."""
-    if not _adb_path:
+    if not _get_adb_path():
         return False
     try:
         process = await asyncio.create_subprocess_exec(
-            _adb_path, "-s", device_id, "forward", "tcp:7001", "tcp:7001",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            *_adb_argv(device_id), "forward", "tcp:7001", "tcp:7001",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-        await asyncio.wait_for(process.communicate(), timeout=5)
+        async with asyncio.timeout(5):
+            await process.communicate()
         if process.returncode == 0:
             trace.log("MAESTRO_FWD", "Port 7001 forwarded for Maestro")
             return True
@@ -834,32 +1215,31 @@ async def _android_start_emulator(
     trace: TraceContext, avd_name: str, cold_boot: bool = False
 ) -> Dict[str, Any]:
     """Boot an Android emulator by AVD name."""
+    _invalidate_android_list_cache()
     emulator_path = shutil.which("emulator")
     if not emulator_path:
         return {"success": False, "error": "emulator command not found"}
 
     # Check if already running
-    if _adb_path:
+    if _get_adb_path():
         process = await asyncio.create_subprocess_exec(
-            _adb_path, "devices",
+            _get_adb_path(), "devices",
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
-        if "emulator-" in stdout.decode() and "device" in stdout.decode():
+        async with asyncio.timeout(10):
+            stdout, _ = await process.communicate()
+        if m := _EMU_RE.search(stdout):
+            device_id = m.group(1).decode()
             trace.log("EMU_SKIP", "Emulator already running")
-            # Get the device ID
-            for line in stdout.decode().split("\n"):
-                if "emulator-" in line and "device" in line:
-                    device_id = line.split()[0]
-                    # Set up Maestro port forwarding
-                    await _setup_maestro_forwarding(trace, device_id)
-                    return {
-                        "success": True,
-                        "device_id": device_id,
-                        "message": "Emulator already running",
-                        "already_running": True,
-                    }
+            # Set up Maestro port forwarding
+            await _setup_maestro_forwarding(trace, device_id)
+            return {
+                "success": True,
+                "device_id": device_id,
+                "message": "Emulator already running",
+                "already_running": True,
+            }
 
     # Build command
     cmd = [emulator_path, "-avd", avd_name, "-no-snapshot-load" if cold_boot else "-no-boot-anim"]
@@ -877,28 +1257,25 @@ async def _android_start_emulator(
         # Wait for device to appear
         for _ in range(60):  # Wait up to 60 seconds
             await asyncio.sleep(1)
-            if _adb_path:
+            if _get_adb_path():
                 check = await asyncio.create_subprocess_exec(
-                    _adb_path, "devices",
+                    _get_adb_path(), "devices",
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
                 )
-                stdout, _ = await asyncio.wait_for(check.communicate(), timeout=5)
-                output = stdout.decode()
-                if "emulator-" in output and "device" in output:
-                    # Extract device ID
-                    for line in output.split("\n"):
-                        if "emulator-" in line and "device" in line:
-                            device_id = line.split()[0]
-                            trace.log("EMU_OK", f"Started {avd_name} as {device_id}")
-                            # Set up Maestro port forwarding
-                            await _setup_maestro_forwarding(trace, device_id)
-                            return {
-                                "success": True,
-                                "device_id": device_id,
-                                "avd_name": avd_name,
-                                "message": f"Emulator {avd_name} started",
-                            }
+                async with asyncio.timeout(5):
+                    stdout, _ = await check.communicate()
+                if m := _EMU_RE.search(stdout):
+                    device_id = m.group(1).decode()
+                    trace.log("EMU_OK", f"Started {avd_name} as {device_id}")
+                    # Set up Maestro port forwarding
+                    await _setup_maestro_forwarding(trace, device_id)
+                    return {
+                        "success": True,
+                        "device_id": device_id,
+                        "avd_name": avd_name,
+                        "message": f"Emulator {avd_name} started",
+                    }
 
         trace.log("EMU_ERR", "Timeout waiting for emulator")
         return {"success": False, "error": "Timeout waiting for emulator to start"}
@@ -912,21 +1289,21 @@ async def _android_stop_emulator(
     trace: TraceContext, device_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Stop an Android emulator."""
-    if not _adb_path:
+    _invalidate_android_list_cache()
+    if not _get_adb_path():
         return {"success": False, "error": "ADB not found"}
 
     # If no device specified, find running emulator
     if not device_id:
         process = await asyncio.create_subprocess_exec(
-            _adb_path, "devices",
+            _get_adb_path(), "devices",
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
-        for line in stdout.decode().split("\n"):
-            if "emulator-" in line and "device" in line:
-                device_id = line.split()[0]
-                break
+        async with asyncio.timeout(10):
+            stdout, _ = await process.communicate()
+        if m := _EMU_RE.search(stdout):
+            device_id = m.group(1).decode()
 
         if not device_id:
             return {"success": True, "message": "No running emulators to shutdown"}
@@ -936,11 +1313,12 @@ async def _android_stop_emulator(
     try:
         # Send emu kill command
         process = await asyncio.create_subprocess_exec(
-            _adb_path, "-s", device_id, "emu", "kill",
+            *_adb_argv(device_id), "emu", "kill",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
-        _, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        async with asyncio.timeout(30):
+            _, stderr = await process.communicate()
 
         if process.returncode != 0:
             error = stderr.decode("utf-8", errors="replace")
@@ -965,7 +1343,6 @@ async def _android_stop_emulator(
 
 async def _android_adb_proxy_status(trace: TraceContext) -> Dict[str, Any]:
     """Get ADB proxy status."""
-    from ..adb_proxy import get_adb_proxy
     proxy = get_adb_proxy()
     status = proxy.status()
     trace.log("PROXY_STATUS", f"running={status['running']}")
@@ -989,7 +1366,6 @@ async def _android_adb_proxy_status(trace: TraceContext) -> Dict[str, Any]:
 
 async def _android_adb_proxy_start(trace: TraceContext) -> Dict[str, Any]:
     """Start ADB proxy for remote ADB access."""
-    from ..adb_proxy import get_adb_proxy
     proxy = get_adb_proxy()
 
     if proxy.is_running:
@@ -1020,7 +1396,6 @@ async def _android_adb_proxy_start(trace: TraceContext) -> Dict[str, Any]:
 
 async def _android_adb_proxy_stop(trace: TraceContext) -> Dict[str, Any]:
     """Stop ADB proxy."""
-    from ..adb_proxy import get_adb_proxy
     proxy = get_adb_proxy()
 
     if not proxy.is_running:
@@ -1129,6 +1504,7 @@ TOOLS = [
                 "timeout": {"type": "integer"},
                 "device": {"type": "string"},
                 "backend": {"type": "string", "enum": ["auto", "maestro", "driver"], "description": "Force specific backend (default: auto)"},
+                "hedge": {"type": "boolean", "description": "Try Maestro and Driver at once when both apply; first success wins (default: false)"},
             },
             "required": ["finder"],
         },
@@ -1179,6 +1555,31 @@ TOOLS = [
             },
         },
     },
+    {
+        "name": "flutter_batch",
+        "description": "Run several tool calls in order in one request, e.g. tap -> enter_text -> tap. Stops at the first failing step unless stop_on_error is false.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "description": "Tool calls to run in order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string", "description": "Tool name"},
+                            "arguments": {"type": "object", "description": "Tool arguments"},
+                        },
+                        "required": ["name"],
+                    },
+                },
+                "stop_on_error": {"type": "boolean", "description": "Stop at the first failing step (default: true)"},
+                "validate_after": {"type": "boolean", "description": "Take one screenshot after the last step (default: false)"},
+                "device": {"type": "string", "description": "Default device for steps that don't set one"},
+            },
+            "required": ["steps"],
+        },
+    },
     # Phase 2: Flutter Driver tools
     {
         "name": "flutter_get_text",
@@ -1195,11 +1596,13 @@ TOOLS = [
     },
     {
         "name": "flutter_widget_tree",
-        "description": "Get the widget/render tree. Requires Flutter Driver extension.",
+        "description": "Get the widget/render tree. Requires Flutter Driver extension. Large trees can be cut down with max_depth/max_nodes.",
         "inputSchema": {
             "type": "object",
             "properties": {
                 "port": {"type": "integer", "description": "Observatory port (default: 9223 for Android)"},
+                "max_depth": {"type": "integer", "description": "Drop nodes nested deeper than this (root = 0)"},
+                "max_nodes": {"type": "integer", "description": "Keep at most this many nodes"},
             },
         },
     },
@@ -1247,7 +1650,9 @@ TOOLS = [
         "description": "Disconnect from Flutter app's Observatory.",
         "inputSchema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "port": {"type": "integer", "description": "Only disconnect the client for this port (default: all)"},
+            },
         },
     },
     {
@@ -1261,6 +1666,17 @@ TOOLS = [
             },
         },
     },
+    {
+        "name": "flutter_driver_ensure_connected",
+        "description": "Discover the VM service URI, forward its port and connect, in one call. Returns immediately if already connected.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "device": {"type": "string", "description": "Device ID (default: first device)"},
+                "host_port": {"type": "integer", "description": "Host port for forwarding (default: 9223)"},
+            },
+        },
+    },
     # Phase 6: Version/Health tools
     {
         "name": "flutter_version",
@@ -1359,17 +1775,40 @@ TOOLS = [
     },
 ]
 
+# TOOLS never changes after import, so serialize it once; the server splices
+# these bytes into /tools and tools/list responses instead of re-encoding.
+_TOOLS_JSON_BYTES = orjson.dumps(TOOLS)
+
+
+def get_tools_json_bytes() -> bytes:
+    """Get the TOOLS list pre-serialized as JSON."""
+    return _TOOLS_JSON_BYTES
+
 
 async def handle_tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle an MCP tool call."""
+    """Handle an MCP tool call.
+
+    The returned dict always carries a boolean ``success`` key (every tool
+    handler sets it, and errors are mapped to ``success: False``), so callers
+    may index ``result["success"]`` directly.
+    """
+    # Interned so the _HANDLERS lookup hits the identity fast path, and retained
+    # traces share one tool_name string instead of one per request. A non-string
+    # name (JSON null, a number) is left as is and ends up as "Unknown tool".
+    if isinstance(name, str):
+        name = sys.intern(name)
     trace_id = generate_trace_id()
     trace = TraceContext(trace_id=trace_id, tool_name=name, arguments=arguments)
-    trace.log("MCP_RECV", f"{name} {arguments}")
+    if trace.enabled:
+        trace.log("MCP_RECV", f"{name} {arguments}")
 
     try:
         result = await _execute_tool(name, arguments, trace)
-        trace.log("MCP_RESP", f"success={result.get('success', False)}")
-        log_trace(trace)
+        if trace.enabled or not result["success"]:
+            trace.log("MCP_RESP", f"success={result['success']}")
+        # Failed calls are always kept; successes only at TRACE_SAMPLE_RATE
+        if not result["success"] or TRACE_SAMPLE_RATE >= 1.0 or random.random() < TRACE_SAMPLE_RATE:
+            log_trace(trace)
         return {**result, "trace_id": trace_id}
     except Exception as e:
         trace.log("MCP_ERR", str(e))
@@ -1379,345 +1818,583 @@ async def handle_tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, An
 
 async def _execute_tool(name: str, arguments: Dict[str, Any], trace: TraceContext) -> Dict[str, Any]:
     """Execute a tool by name."""
-    timeout = arguments.get("timeout", 30)
-    device = arguments.get("device")
-
-    if name == "flutter_tap":
-        backend_arg = arguments.get("backend", "auto")
-        finder = arguments["finder"].copy()
-
-        # If explicit backend requested, add to finder for selector
-        if backend_arg != "auto":
-            finder["backend"] = backend_arg
-
-        executor = _get_unified_executor()
-        result = await executor.tap(finder, trace, timeout, device)
-        response = {
-            "success": result.success,
-            "error": result.error,
-            "backend": result.backend_used.value if result.backend_used else None,
-            "backends_tried": result.backends_tried,
-        }
-        if result.fallback_occurred:
-            response["fallback"] = True
-        return response
-
-    elif name == "flutter_double_tap":
-        result = await _maestro.double_tap(arguments["finder"], trace, timeout, device)
-        return {"success": result.success, "error": result.error_message}
-
-    elif name == "flutter_long_press":
-        result = await _maestro.long_press(arguments["finder"], trace, timeout, device)
-        return {"success": result.success, "error": result.error_message}
-
-    elif name == "flutter_swipe":
-        result = await _maestro.swipe(arguments["direction"], trace, timeout, device)
-        return {"success": result.success, "error": result.error_message}
-
-    elif name == "flutter_enter_text":
-        result = await _maestro.enter_text(arguments["text"], arguments.get("finder"), trace, timeout, device)
-        return {"success": result.success, "error": result.error_message}
-
-    elif name == "flutter_clear_text":
-        result = await _maestro.clear_text(trace, timeout, device)
-        return {"success": result.success, "error": result.error_message}
-
-    elif name == "flutter_assert_visible":
-        backend_arg = arguments.get("backend", "auto")
-        finder = arguments["finder"].copy()
-        if backend_arg != "auto":
-            finder["backend"] = backend_arg
-
-        executor = _get_unified_executor()
-        result = await executor.assert_visible(finder, trace, timeout, device)
-        response = {
-            "success": result.success,
-            "error": result.error,
-            "backend": result.backend_used.value if result.backend_used else None,
-            "backends_tried": result.backends_tried,
-        }
-        if result.fallback_occurred:
-            response["fallback"] = True
-        return response
-
-    elif name == "flutter_assert_not_visible":
-        backend_arg = arguments.get("backend", "auto")
-        finder = arguments["finder"].copy()
-        if backend_arg != "auto":
-            finder["backend"] = backend_arg
-
-        executor = _get_unified_executor()
-        result = await executor.assert_not_visible(finder, trace, timeout, device)
-        response = {
-            "success": result.success,
-            "error": result.error,
-            "backend": result.backend_used.value if result.backend_used else None,
-        }
-        if result.fallback_occurred:
-            response["fallback"] = True
-        return response
-
-    elif name == "flutter_screenshot":
-        # Smart screenshot: detect platform, use native method, fallback to Maestro
-        import os as os_mod
-        server_port = int(os_mod.environ.get("FLUTTER_CONTROL_PORT", "9225"))
-        is_ios = server_port in (9226, 9227)
-
-        if is_ios:
-            # Try simctl first
-            result = await _simctl_screenshot(trace, device)
-            if result.get("success"):
-                result["method"] = "simctl"
-                return result
-            trace.log("SCREENSHOT_FALLBACK", f"simctl failed: {result.get('error')}, trying Maestro")
-        else:
-            # Try ADB first
-            result = await _adb_screenshot(trace, device)
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return {"success": False, "error": f"Unknown tool: {name}"}
+    return await handler(arguments, trace, arguments.get("timeout", 30), arguments.get("device"))
+
+
+# Tool handlers. Each takes (arguments, trace, timeout, device) and returns the
+# tool result dict; _HANDLERS at the bottom maps tool names to them.
+# Handlers must never mutate `arguments` (the trace keeps a reference to it):
+# build a new dict instead, e.g. {**finder, "backend": backend_arg}.
+
+_NOT_CONNECTED_ERROR = "Not connected to Observatory. Call flutter_driver_connect first or ensure app is running with driver extension."
+
+
+async def _handle_tap(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_tap: tap via the unified executor (Maestro/Driver with fallback)."""
+    backend_arg = arguments.get("backend", "auto")
+    finder = arguments["finder"]
+
+    # If explicit backend requested, add to (a copy of) the finder for selector
+    if backend_arg != "auto":
+        finder = {**finder, "backend": backend_arg}
+
+    executor = _get_unified_executor()
+    result = await executor.tap(finder, trace, timeout, device)
+    response = {
+        "success": result.success,
+        "error": result.error,
+        "backend": result.backend_used.value if result.backend_used else None,
+        "backends_tried": result.backends_tried,
+    }
+    if result.fallback_occurred:
+        response["fallback"] = True
+    return response
+
+
+# Maestro tools that just forward arguments and report success/error:
+# tool name -> (MaestroWrapper method, required argument names, optional argument names)
+_MAESTRO_SIMPLE: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...], Tuple[str, ...]]] = {
+    "flutter_double_tap": (MaestroWrapper.double_tap, ("finder",), ()),
+    "flutter_long_press": (MaestroWrapper.long_press, ("finder",), ()),
+    "flutter_swipe": (MaestroWrapper.swipe, ("direction",), ()),
+    "flutter_enter_text": (MaestroWrapper.enter_text, ("text",), ("finder",)),
+    "flutter_clear_text": (MaestroWrapper.clear_text, (), ()),
+}
+
+
+async def _handle_maestro_simple(
+    method: Callable[..., Awaitable[Any]], required: Tuple[str, ...], optional: Tuple[str, ...],
+    arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str],
+) -> Dict[str, Any]:
+    """Run one of the _MAESTRO_SIMPLE tools (bound per tool with functools.partial)."""
+    args = [arguments[k] for k in required]
+    args.extend(arguments.get(k) for k in optional)
+    result = await method(_get_maestro(), *args, trace, timeout, device)
+    return {"success": result.success, "error": result.error_message}
+
+
+async def _handle_assert_visible(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_assert_visible via the unified executor."""
+    backend_arg = arguments.get("backend", "auto")
+    finder = arguments["finder"]
+    if backend_arg != "auto":
+        finder = {**finder, "backend": backend_arg}
+
+    executor = _get_unified_executor()
+    result = await executor.assert_visible(finder, trace, timeout, device, hedge=arguments.get("hedge", False))
+    response = {
+        "success": result.success,
+        "error": result.error,
+        "backend": result.backend_used.value if result.backend_used else None,
+        "backends_tried": result.backends_tried,
+    }
+    if result.fallback_occurred:
+        response["fallback"] = True
+    return response
+
+
+async def _handle_assert_not_visible(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_assert_not_visible via the unified executor."""
+    backend_arg = arguments.get("backend", "auto")
+    finder = arguments["finder"]
+    if backend_arg != "auto":
+        finder = {**finder, "backend": backend_arg}
+
+    executor = _get_unified_executor()
+    result = await executor.assert_not_visible(finder, trace, timeout, device)
+    response = {
+        "success": result.success,
+        "error": result.error,
+        "backend": result.backend_used.value if result.backend_used else None,
+    }
+    if result.fallback_occurred:
+        response["fallback"] = True
+    return response
+
+
+# Head start the native screenshot gets before the Maestro fallback is started
+async def _shielded_maestro_screenshot(trace: TraceContext, timeout: int, device: Optional[str]):
+    """Maestro screenshot racing a slow native capture (the race's fallback leg)."""
+    # Once started, let it run to completion even if the native leg wins
+    # (a legacy flow can't be stopped halfway); its result is then discarded
+    screenshot = asyncio.ensure_future(_get_maestro().screenshot(trace, timeout, device))
+    try:
+        return await asyncio.shield(screenshot)
+    except asyncio.CancelledError:
+        screenshot.add_done_callback(_discard_maestro_screenshot)
+        raise
+
+
+def _discard_maestro_screenshot(task: "asyncio.Future[MaestroResult]"):
+    """Delete the PNG a losing legacy-mode Maestro screenshot wrote."""
+    if task.cancelled() or task.exception() is not None:
+        return
+    screenshot_file = task.result().screenshot_file
+    if screenshot_file:
+        Path(screenshot_file).unlink(missing_ok=True)
+
+
+async def _handle_screenshot(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """
+    flutter_screenshot: native method (simctl/adb) with a Maestro fallback.
+
+    Maestro starts as soon as the native capture fails, or once it has run
+    for SCREENSHOT_FALLBACK_DELAY; after that the first successful result
+    wins. A started Maestro capture is never cancelled (it holds the Maestro
+    stream, or runs a whole legacy flow), so the delay sits above a normal
+    native capture and only a stalled one pays for the second attempt.
+    """
+    is_ios = _IS_IOS_SERVER
+    native_method = "simctl" if is_ios else "adb"
+
+    native = asyncio.create_task(_simctl_screenshot(trace, device) if is_ios else _adb_screenshot(trace, device))
+    fallback = None
+    try:
+        done, _ = await asyncio.wait({native}, timeout=SCREENSHOT_FALLBACK_DELAY)
+        if done:
+            result = native.result()
             if result.get("success"):
-                result["method"] = "adb"
+                result["method"] = native_method
                 return result
-            trace.log("SCREENSHOT_FALLBACK", f"ADB failed: {result.get('error')}, trying Maestro")
-
-        # Fallback to Maestro
-        maestro_result = await _maestro.screenshot(trace, timeout, device)
-        response = {"success": maestro_result.success, "error": maestro_result.error_message, "method": "maestro"}
-        if maestro_result.screenshot_base64:
-            # Save to file instead of returning base64
-            platform = "ios" if is_ios else "android"
-            screenshot_path = _get_screenshot_path(trace.trace_id, f"{platform}_maestro")
-            image_data = base64.b64decode(maestro_result.screenshot_base64)
-            screenshot_path.write_bytes(image_data)
-            response["path"] = str(screenshot_path)
-            response["size_bytes"] = len(image_data)
-            response["format"] = "png"
-        return response
-
-    elif name == "flutter_screenshot_maestro":
-        # Explicit Maestro screenshot
-        import os as os_mod
-        server_port = int(os_mod.environ.get("FLUTTER_CONTROL_PORT", "9225"))
-        platform = "ios" if server_port in (9226, 9227) else "android"
-
-        result = await _maestro.screenshot(trace, timeout, device)
-        response = {"success": result.success, "error": result.error_message, "method": "maestro"}
-        if result.screenshot_base64:
-            # Save to file instead of returning base64
-            screenshot_path = _get_screenshot_path(trace.trace_id, f"{platform}_maestro")
-            image_data = base64.b64decode(result.screenshot_base64)
-            screenshot_path.write_bytes(image_data)
-            response["path"] = str(screenshot_path)
-            response["size_bytes"] = len(image_data)
-            response["format"] = "png"
-        return response
-
-    elif name == "flutter_debug_trace":
-        trace_id = arguments.get("trace_id")
-        if trace_id:
-            # Get specific trace
-            trace_data = get_trace(trace_id)
-            if trace_data:
-                return {"success": True, "trace": trace_data}
-            return {"success": False, "error": f"Trace not found: {trace_id}"}
+            trace.log("SCREENSHOT_FALLBACK", f"{native_method} failed: {result.get('error')}, using Maestro")
+            return _maestro_screenshot_response(trace, await _get_maestro().screenshot(trace, timeout, device))
+
+        trace.log("SCREENSHOT_FALLBACK", f"{native_method} still running after {SCREENSHOT_FALLBACK_DELAY}s, starting Maestro")
+        fallback = asyncio.create_task(_shielded_maestro_screenshot(trace, timeout, device))
+        pending = {native, fallback}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if native in done:
+                result = native.result()
+                if result.get("success"):
+                    result["method"] = native_method
+                    if fallback.done():
+                        _discard_maestro_screenshot(fallback)
+                    return result
+                trace.log("SCREENSHOT_FALLBACK", f"{native_method} failed: {result.get('error')}, using Maestro")
+            if fallback in done:
+                maestro_result = fallback.result()
+                # A failed Maestro attempt only counts once native has failed too
+                if maestro_result.success or native.done():
+                    break
+    finally:
+        for task in (native, fallback):
+            if task is not None and not task.done():
+                task.cancel()
+
+    return _maestro_screenshot_response(trace, maestro_result)
+
+
+async def _handle_screenshot_maestro(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_screenshot_maestro: explicit Maestro screenshot."""
+    result = await _get_maestro().screenshot(trace, timeout, device)
+    return _maestro_screenshot_response(trace, result)
+
+
+async def _handle_debug_trace(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_debug_trace: return one trace by id, or the most recent ones."""
+    # Traces come back as JSON serialized when they were saved; the response
+    # encoder splices the bytes in instead of walking the dicts again
+    trace_id = arguments.get("trace_id")
+    if trace_id:
+        # Get specific trace
+        trace_data = get_trace_json(trace_id)
+        if trace_data:
+            return {"success": True, "trace": trace_data}
+        return {"success": False, "error": f"Trace not found: {trace_id}"}
+    else:
+        # Get recent traces
+        count = arguments.get("count", 5)
+        traces = get_recent_traces_json(count)
+        return {"success": True, "traces": traces}
+
+
+async def _handle_batch(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_batch: run a sequence of tool calls in-process under one trace."""
+    stop_on_error = arguments.get("stop_on_error", True)
+    steps = arguments.get("steps")
+    if not isinstance(steps, list):
+        return {"success": False, "error": "steps must be a list of {name, arguments} objects", "completed": 0, "results": []}
+
+    results = []
+    for index, step in enumerate(steps):
+        # Malformed steps become failed results rather than aborting the batch,
+        # so the steps that already ran are still reported
+        name = step.get("name") if isinstance(step, dict) else None
+        step_args = (step.get("arguments") if isinstance(step, dict) else None) or {}
+        trace.log("BATCH_STEP", f"{index}: {name}")
+        if not isinstance(name, str) or not name or not isinstance(step_args, dict):
+            result = {"success": False, "error": f"Step {index} must be an object with a string name and object arguments"}
+        elif name == "flutter_batch":
+            result = {"success": False, "error": "flutter_batch steps cannot be nested"}
         else:
-            # Get recent traces
-            count = arguments.get("count", 5)
-            traces = get_recent_traces(count)
-            return {"success": True, "traces": traces}
+            if device and "device" not in step_args:
+                step_args = {**step_args, "device": device}
+            try:
+                result = await _execute_tool(name, step_args, trace)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+        # The step's name wins over any "name" field in the tool's result
+        results.append({**result, "name": name})
+
+        if not result["success"] and stop_on_error:
+            trace.log("BATCH_STOP", f"Step {index} ({name}) failed: {result.get('error')}")
+            break
+
+    response = {
+        "success": all(r["success"] for r in results),
+        "completed": len(results),
+        "results": results,
+    }
+    if arguments.get("validate_after"):
+        response["screenshot"] = await _handle_screenshot({}, trace, timeout, device)
+    return response
+
+
+# Phase 2: Flutter Driver tools
+
+async def _handle_driver_connect(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_driver_connect: connect to an explicit URI/port, reusing a pooled client if live."""
+    uri = arguments.get("uri")
+    port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
+    host = arguments.get("host", "localhost")
+    target = uri if uri else f"{host}:{port}"
+
+    key = (host, port, uri)
+    client = _driver_pool.get(key)
+    if client is None:
+        # A new URI on the same host:port means the app restarted; close the
+        # clients for its old VM service instead of leaving them open
+        for stale_key in [k for k in _driver_pool if k[:2] == (host, port)]:
+            await _driver_pool.pop(stale_key).disconnect()
+        client = _driver_pool[key] = FlutterDriverClient(host=host, port=port, uri=uri)
+    _set_driver_client(port, client)
 
-    # Phase 2: Flutter Driver tools
-    elif name == "flutter_driver_connect":
-        uri = arguments.get("uri")
-        port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
-        host = arguments.get("host", "localhost")
-        global _driver_client, _unified_executor
-        from ..driver import FlutterDriverClient
-        _driver_client = FlutterDriverClient(host=host, port=port, uri=uri)
-        # Reset unified executor so it picks up the new driver client
-        _unified_executor = None
-        connected = await _driver_client.connect(trace)
-        if connected:
-            target = uri if uri else f"{host}:{port}"
-            return {"success": True, "message": f"Connected to Observatory at {target}"}
-        target = uri if uri else f"{host}:{port}"
-        return {"success": False, "error": f"Failed to connect to Observatory at {target}"}
-
-    elif name == "flutter_driver_disconnect":
-        if _driver_client:
-            await _driver_client.disconnect()
-            _driver_client = None
-        return {"success": True, "message": "Disconnected"}
-
-    elif name == "flutter_driver_discover":
-        import os as os_module
-        device_id = arguments.get("device")
-        host_port = arguments.get("host_port", 9223)
-
-        # Detect iOS: server port 9226/9227 or device ID is a UDID
-        server_port = int(os_module.environ.get("FLUTTER_CONTROL_PORT", "9225"))
-        is_ios_server = server_port in (9226, 9227)
-        is_ios_udid = device_id and len(device_id) == 36 and device_id.count("-") == 4
-        is_ios = is_ios_server or is_ios_udid
-
-        # Discover VM service URI from device logs
-        uri = await _discover_vm_service_uri(trace, device_id)
-        if not uri:
-            return {"success": False, "error": "No VM service URI found. Is a Flutter app with driver extension running?"}
-
-        # Extract port from URI (e.g., http://127.0.0.1:42291/abc=/)
-        import re
-        port_match = re.search(r":(\d+)/", uri)
-        if not port_match:
-            return {"success": False, "error": f"Could not parse port from URI: {uri}"}
-
-        device_port = int(port_match.group(1))
-
-        # Set up port forwarding (not needed for iOS simulator)
-        if not await _forward_vm_service_port(trace, device_port, host_port, device_id, is_ios=is_ios):
-            return {"success": False, "error": f"Failed to forward port {device_port} to {host_port}"}
-
-        # For iOS, use URI as-is; for Android, use forwarded URI
-        if is_ios:
-            result_uri = uri
-            message = f"VM service discovered at {uri}"
-        else:
-            result_uri = uri.replace(f"127.0.0.1:{device_port}", f"localhost:{host_port}")
-            message = f"VM service discovered and forwarded to localhost:{host_port}"
+    if client.is_connected:
+        trace.log("DRIVER_POOLED", f"Reusing connection to {target}")
+        return {"success": True, "message": f"Connected to Observatory at {target}"}
+    # ensure_connected clears any stale socket left on a pooled client first
+    if await client.ensure_connected(trace):
+        return {"success": True, "message": f"Connected to Observatory at {target}"}
+    return {"success": False, "error": f"Failed to connect to Observatory at {target}"}
 
-        return {
-            "success": True,
-            "uri": result_uri,
-            "device_port": device_port,
-            "host_port": host_port if not is_ios else device_port,
-            "message": message,
-        }
 
-    elif name == "flutter_get_text":
-        port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
-        if not await _ensure_driver_connected(trace, port):
-            return {"success": False, "error": "Not connected to Observatory. Call flutter_driver_connect first or ensure app is running with driver extension."}
-
-        from ..driver.finders import Finder
-        finder = Finder.from_dict(arguments["finder"])
-        response = await _driver_client.get_text(finder, trace, timeout)
-        if response.success and response.response:
-            # Flutter Driver returns {"response": "text value", "isError": false}
-            text = response.response.get("response") or response.response.get("text")
-            return {"success": True, "text": text}
-        return {"success": False, "error": response.error or "Failed to get text"}
-
-    elif name == "flutter_widget_tree":
-        port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
-        if not await _ensure_driver_connected(trace, port):
-            return {"success": False, "error": "Not connected to Observatory. Call flutter_driver_connect first or ensure app is running with driver extension."}
-
-        response = await _driver_client.get_render_tree(trace)
-        if response.success and response.response:
-            # Flutter Driver returns {"response": "tree text", "isError": false}
-            tree = response.response.get("response") or response.response.get("tree")
+async def _handle_driver_disconnect(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_driver_disconnect: close the clients for a port (default: all), pooled ones included."""
+    await close_driver_clients(arguments.get("port"))
+    return {"success": True, "message": "Disconnected"}
+
+
+async def _handle_driver_discover(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_driver_discover: find the VM service URI and forward its port."""
+    host_port = arguments.get("host_port", 9223)
+
+    # Detect iOS: server port 9226/9227 or device ID is a UDID
+    is_ios = _IS_IOS_SERVER or _is_ios_udid(device)
+
+    # Discover VM service URI from device logs (explicit discovery is always fresh)
+    uri = await _discover_vm_service_uri(trace, device, use_cache=False)
+    if not uri:
+        return {"success": False, "error": "No VM service URI found. Is a Flutter app with driver extension running?"}
+
+    # Extract port from URI (e.g., http://127.0.0.1:42291/abc=/)
+    port_match = _VM_PORT_RE.search(uri)
+    if not port_match:
+        return {"success": False, "error": f"Could not parse port from URI: {uri}"}
+
+    device_port = int(port_match.group(1))
+
+    # Set up port forwarding (not needed for iOS simulator)
+    if not await _forward_vm_service_port(trace, device_port, host_port, device, is_ios=is_ios):
+        return {"success": False, "error": f"Failed to forward port {device_port} to {host_port}"}
+
+    # For iOS, use URI as-is; for Android, use forwarded URI
+    if is_ios:
+        result_uri = uri
+        message = f"VM service discovered at {uri}"
+    else:
+        result_uri = uri.replace(f"127.0.0.1:{device_port}", f"localhost:{host_port}")
+        message = f"VM service discovered and forwarded to localhost:{host_port}"
+
+    return {
+        "success": True,
+        "uri": result_uri,
+        "device_port": device_port,
+        "host_port": host_port if not is_ios else device_port,
+        "message": message,
+    }
+
+
+async def _handle_driver_ensure_connected(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_driver_ensure_connected: flutter_driver_discover + flutter_driver_connect in one round trip."""
+    host_port = arguments.get("host_port", OBSERVATORY_PORT_ANDROID)
+    client = _driver_clients.get(host_port)
+    if (
+        client is not None
+        and client.is_connected
+        and (device is None or _ensured_devices.get(host_port) == device)
+    ):
+        trace.log("DRIVER_POOLED", f"Already connected on port {host_port}")
+        return {"success": True, "uri": client.uri, "host_port": host_port, "message": "Already connected to Observatory"}
+
+    discovered = await _handle_driver_discover({**arguments, "host_port": host_port}, trace, timeout, device)
+    if not discovered["success"]:
+        return discovered
+    connected = await _handle_driver_connect({"uri": discovered["uri"], "port": host_port}, trace, timeout, device)
+    if not connected["success"]:
+        return connected
+    _ensured_devices[host_port] = device
+    return {**discovered, "message": connected["message"]}
+
+
+async def _handle_get_text(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_get_text (Driver)."""
+    port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
+    if not await _ensure_driver_connected(trace, port):
+        return {"success": False, "error": _NOT_CONNECTED_ERROR}
+
+    finder = Finder.from_dict(arguments["finder"])
+    response = await _get_driver_client(port).get_text(finder, trace, timeout)
+    if response.success and response.response:
+        # Flutter Driver returns {"response": "text value", "isError": false}
+        text = response.response.get("response") or response.response.get("text")
+        return {"success": True, "text": text}
+    return {"success": False, "error": response.error or "Failed to get text"}
+
+
+_TREE_CONNECTORS = ("─", "═", "━")
+
+
+def _prune_render_tree(tree: str, max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Cut a toStringDeep() render tree dump down to max_depth levels / max_nodes nodes.
+
+    Node header lines are the root (first line) and lines whose text follows a
+    connector ("└─child: ..."); other lines are properties of the node above
+    and are kept or dropped with it. Depth comes from a stack of connector
+    columns, so it doesn't depend on the dump's indent width.
+
+    Returns (pruned_tree, number_of_nodes_dropped).
+    """
+    kept = []
+    columns = []  # connector column of each ancestor of the current node
+    nodes = dropped = 0
+    keep_node = True
+    for index, line in enumerate(tree.splitlines()):
+        body = line.lstrip(" │╎┃|├└╘┝┗┣─═━")
+        col = len(line) - len(body)
+        if index == 0 or (col and line[col - 1] in _TREE_CONNECTORS):
+            while columns and columns[-1] >= col:
+                columns.pop()
+            depth = len(columns)
+            columns.append(col)
+            keep_node = (max_depth is None or depth <= max_depth) and (max_nodes is None or nodes < max_nodes)
+            if keep_node:
+                nodes += 1
+            else:
+                dropped += 1
+        if keep_node:
+            kept.append(line)
+    if dropped:
+        kept.append(f"... {dropped} nodes truncated")
+    return "\n".join(kept), dropped
+
+
+async def _handle_widget_tree(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_widget_tree (Driver render tree), optionally pruned by depth/node count."""
+    port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
+    if not await _ensure_driver_connected(trace, port):
+        return {"success": False, "error": _NOT_CONNECTED_ERROR}
+
+    response = await _get_driver_client(port).get_render_tree(trace)
+    if response.success and response.response:
+        # Flutter Driver returns {"response": "tree text", "isError": false}
+        tree = response.response.get("response") or response.response.get("tree")
+        max_depth = arguments.get("max_depth")
+        max_nodes = arguments.get("max_nodes")
+        if max_depth is None and max_nodes is None:
             return {"success": True, "tree": tree}
-        return {"success": False, "error": response.error or "Failed to get widget tree"}
-
-    elif name == "flutter_driver_tap":
-        port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
-        if not await _ensure_driver_connected(trace, port):
-            return {"success": False, "error": "Not connected to Observatory. Call flutter_driver_connect first or ensure app is running with driver extension."}
-
-        from ..driver.finders import Finder
-        finder = Finder.from_dict(arguments["finder"])
-        response = await _driver_client.tap(finder, trace, timeout)
-        return {"success": response.success, "error": response.error}
-
-    elif name == "flutter_run":
-        project_path = arguments["project_path"]
-        port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
-        device_arg = arguments.get("device")
-        flavor = arguments.get("flavor")
-
-        return await _flutter_run(project_path, port, device_arg, flavor, trace, timeout)
-
-    elif name == "flutter_version":
-        # Import version info from package
-        import os
-        import platform
-        from datetime import datetime
-        from pathlib import Path
-        from .. import __version__
-
-        port = int(os.environ.get("FLUTTER_CONTROL_PORT", 9225))
-        plat = "ios" if port in (9226, 9227) else "android"
-
-        # Get deployment time from tools.py mtime
-        try:
-            tools_file = Path(__file__)
-            mtime = tools_file.stat().st_mtime
-            deployed_at = datetime.utcfromtimestamp(mtime).isoformat() + "Z"
-        except:
-            deployed_at = None
-
-        # Get git commit
-        git_commit = None
-        try:
-            import subprocess
-            result = subprocess.run(
-                ["git", "rev-parse", "--short", "HEAD"],
-                cwd=Path(__file__).parent.parent.parent,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                git_commit = result.stdout.strip()
-        except:
-            pass
 
-        return {
-            "success": True,
-            "service": "flutter-control",
-            "platform": plat,
-            "version": __version__,
-            "deployed_at": deployed_at,
-            "git_commit": git_commit,
-            "hostname": platform.node(),
-        }
+        # The tree text may also arrive wrapped as {"tree": "..."}
+        text = tree.get("tree") if isinstance(tree, dict) else tree
+        if not isinstance(text, str):
+            return {"success": True, "tree": tree}
+        pruned, dropped = _prune_render_tree(text, max_depth, max_nodes)
+        if dropped:
+            trace.log("TREE_PRUNED", f"Dropped {dropped} nodes (max_depth={max_depth}, max_nodes={max_nodes})")
+        tree = {**tree, "tree": pruned} if isinstance(tree, dict) else pruned
+        return {"success": True, "tree": tree, "truncated": bool(dropped)}
+    return {"success": False, "error": response.error or "Failed to get widget tree"}
 
-    # iOS Simulator lifecycle tools
-    elif name == "ios_list_devices":
-        return await _ios_list_devices(trace)
 
-    elif name == "ios_start_simulator":
-        device_name = arguments.get("device_name")
-        udid = arguments.get("udid")
-        headless = arguments.get("headless")
-        return await _ios_start_simulator(trace, device_name, udid, headless)
+async def _handle_driver_tap(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_driver_tap (Driver only)."""
+    port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
+    if not await _ensure_driver_connected(trace, port):
+        return {"success": False, "error": _NOT_CONNECTED_ERROR}
 
-    elif name == "ios_stop_simulator":
-        udid = arguments.get("udid")
-        return await _ios_stop_simulator(trace, udid)
+    finder = Finder.from_dict(arguments["finder"])
+    response = await _get_driver_client(port).tap(finder, trace, timeout)
+    return {"success": response.success, "error": response.error}
 
-    # Android Emulator lifecycle tools
-    elif name == "android_list_devices":
-        return await _android_list_devices(trace)
 
-    elif name == "android_start_emulator":
-        avd_name = arguments.get("avd_name")
-        if not avd_name:
-            return {"success": False, "error": "avd_name is required"}
-        cold_boot = arguments.get("cold_boot", False)
-        return await _android_start_emulator(trace, avd_name, cold_boot)
+async def _handle_run(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_run."""
+    project_path = arguments["project_path"]
+    port = arguments.get("port", OBSERVATORY_PORT_ANDROID)
+    flavor = arguments.get("flavor")
 
-    elif name == "android_stop_emulator":
-        device_id = arguments.get("device_id")
-        return await _android_stop_emulator(trace, device_id)
+    return await _flutter_run(project_path, port, device, flavor, trace, timeout)
 
-    # ADB Proxy tools
-    elif name == "android_adb_proxy_status":
-        return await _android_adb_proxy_status(trace)
 
-    elif name == "android_adb_proxy_start":
-        return await _android_adb_proxy_start(trace)
+def _get_deployed_at() -> Optional[str]:
+    """Get deployment time from tools.py mtime."""
+    try:
+        mtime = Path(__file__).stat().st_mtime
+    except OSError:
+        return None
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
 
-    elif name == "android_adb_proxy_stop":
-        return await _android_adb_proxy_stop(trace)
+_DEPLOYED_AT = _get_deployed_at()
 
-    else:
-        return {"success": False, "error": f"Unknown tool: {name}"}
+# flutter_version fields, filled in on first call
+_version_info_cache: Optional[Dict[str, Any]] = None
+
+
+async def _git_commit() -> Optional[str]:
+    """Short HEAD commit of the checkout the server runs from, or None."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", "rev-parse", "--short", "HEAD",
+            cwd=Path(__file__).parent.parent.parent,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        async with asyncio.timeout(5):
+            stdout, _ = await process.communicate()
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    if process.returncode != 0:
+        return None
+    return stdout.decode().strip() or None
+
+
+async def get_version_info() -> Dict[str, Any]:
+    """flutter_version / GET /version fields; all fixed for the lifetime of the server process."""
+    global _version_info_cache
+    if _version_info_cache is not None:
+        return _version_info_cache
+
+    # Only needed here, once per process; kept out of the module import
+    import platform
+
+    _version_info_cache = {
+        "service": "flutter-control",
+        "platform": _PLATFORM_STR,
+        "version": __version__,
+        "deployed_at": _DEPLOYED_AT,
+        "git_commit": await _git_commit(),
+        "hostname": platform.node(),
+    }
+    return _version_info_cache
+
+
+async def _handle_version(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """flutter_version: service version and deployment info (computed once, then cached)."""
+    return {"success": True, **await get_version_info()}
+
+
+# iOS Simulator lifecycle tools
+
+async def _handle_ios_list_devices(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """ios_list_devices."""
+    return await _ios_list_devices(trace)
+
+
+async def _handle_ios_start_simulator(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """ios_start_simulator."""
+    return await _ios_start_simulator(trace, arguments.get("device_name"), arguments.get("udid"), arguments.get("headless"))
+
+
+async def _handle_ios_stop_simulator(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """ios_stop_simulator."""
+    return await _ios_stop_simulator(trace, arguments.get("udid"))
+
+
+# Android Emulator lifecycle tools
+
+async def _handle_android_list_devices(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_list_devices."""
+    return await _android_list_devices(trace)
+
+
+async def _handle_android_start_emulator(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_start_emulator."""
+    avd_name = arguments.get("avd_name")
+    if not avd_name:
+        return {"success": False, "error": "avd_name is required"}
+    return await _android_start_emulator(trace, avd_name, arguments.get("cold_boot", False))
+
+
+async def _handle_android_stop_emulator(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_stop_emulator."""
+    return await _android_stop_emulator(trace, arguments.get("device_id"))
+
+
+# ADB Proxy tools
+
+async def _handle_adb_proxy_status(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_adb_proxy_status."""
+    return await _android_adb_proxy_status(trace)
+
+
+async def _handle_adb_proxy_start(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_adb_proxy_start."""
+    return await _android_adb_proxy_start(trace)
+
+
+async def _handle_adb_proxy_stop(arguments: Dict[str, Any], trace: TraceContext, timeout: int, device: Optional[str]) -> Dict[str, Any]:
+    """android_adb_proxy_stop."""
+    return await _android_adb_proxy_stop(trace)
+
+
+# Tool name -> handler, looked up once per call by _execute_tool
+_HANDLERS: Dict[str, Callable[[Dict[str, Any], TraceContext, int, Optional[str]], Awaitable[Dict[str, Any]]]] = {
+    "flutter_tap": _handle_tap,
+    "flutter_assert_visible": _handle_assert_visible,
+    "flutter_assert_not_visible": _handle_assert_not_visible,
+    "flutter_screenshot": _handle_screenshot,
+    "flutter_screenshot_maestro": _handle_screenshot_maestro,
+    "flutter_debug_trace": _handle_debug_trace,
+    "flutter_batch": _handle_batch,
+    "flutter_driver_connect": _handle_driver_connect,
+    "flutter_driver_disconnect": _handle_driver_disconnect,
+    "flutter_driver_discover": _handle_driver_discover,
+    "flutter_driver_ensure_connected": _handle_driver_ensure_connected,
+    "flutter_get_text": _handle_get_text,
+    "flutter_widget_tree": _handle_widget_tree,
+    "flutter_driver_tap": _handle_driver_tap,
+    "flutter_run": _handle_run,
+    "flutter_version": _handle_version,
+    "ios_list_devices": _handle_ios_list_devices,
+    "ios_start_simulator": _handle_ios_start_simulator,
+    "ios_stop_simulator": _handle_ios_stop_simulator,
+    "android_list_devices": _handle_android_list_devices,
+    "android_start_emulator": _handle_android_start_emulator,
+    "android_stop_emulator": _handle_android_stop_emulator,
+    "android_adb_proxy_status": _handle_adb_proxy_status,
+    "android_adb_proxy_start": _handle_adb_proxy_start,
+    "android_adb_proxy_stop": _handle_adb_proxy_stop,
+}
+_HANDLERS.update(
+    (name, functools.partial(_handle_maestro_simple, *spec)) for name, spec in _MAESTRO_SIMPLE.items()
+)
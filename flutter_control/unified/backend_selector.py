@@ -1,7 +1,8 @@
 """Backend selector - determines which backend to use based on finder."""
 
+import functools
 from enum import Enum
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
 
 class Backend(Enum):
@@ -22,6 +23,27 @@ class BackendSelector:
     # Finders that work with both
     BOTH_FINDERS = {"text", "semanticsLabel"}
 
+    # Partitions of the above, computed once rather than on every call
+    _DRIVER_ONLY = frozenset(DRIVER_FINDERS - BOTH_FINDERS)
+    _MAESTRO_ONLY = frozenset(MAESTRO_FINDERS - BOTH_FINDERS)
+    _BOTH = frozenset(BOTH_FINDERS)
+
+    # Finder keys that are options rather than selectors
+    _EXCLUDE = frozenset({"first", "index", "backend", "timeout"})
+
+    @classmethod
+    def decide(cls, finder: Dict[str, Any]) -> Tuple[Backend, str, Tuple[Backend, ...]]:
+        """
+        Select the primary backend and the fallback order in one step.
+
+        The decision depends only on which selector keys are present (and any
+        explicit backend), so it is cached on that signature.
+
+        Returns:
+            Tuple of (primary_backend, reason, backends_to_try)
+        """
+        return cls._decide(frozenset(finder.keys() - cls._EXCLUDE), finder.get("backend"))
+
     @classmethod
     def select(cls, finder: Dict[str, Any]) -> Tuple[Backend, str]:
         """
@@ -30,35 +52,8 @@ class BackendSelector:
         Returns:
             Tuple of (primary_backend, reason)
         """
-        finder_keys = set(finder.keys()) - {"first", "index", "backend", "timeout"}
-
-        # Check if backend is explicitly specified
-        if "backend" in finder:
-            explicit = finder["backend"].lower()
-            if explicit == "maestro":
-                return Backend.MAESTRO, "explicit backend=maestro"
-            elif explicit == "driver":
-                return Backend.DRIVER, "explicit backend=driver"
-
-        # Check for driver-only finders first (they're more specific)
-        driver_only = cls.DRIVER_FINDERS - cls.BOTH_FINDERS
-        if finder_keys & driver_only:
-            key = (finder_keys & driver_only).pop()
-            return Backend.DRIVER, f"{key} finder requires driver"
-
-        # Check for maestro-preferred finders
-        maestro_preferred = cls.MAESTRO_FINDERS - cls.BOTH_FINDERS
-        if finder_keys & maestro_preferred:
-            key = (finder_keys & maestro_preferred).pop()
-            return Backend.MAESTRO, f"{key} finder prefers maestro"
-
-        # For finders that work with both, prefer Maestro (more stable)
-        if finder_keys & cls.BOTH_FINDERS:
-            key = (finder_keys & cls.BOTH_FINDERS).pop()
-            return Backend.MAESTRO, f"{key} finder (maestro preferred)"
-
-        # Default to Maestro
-        return Backend.MAESTRO, "default"
+        primary, reason, _ = cls.decide(finder)
+        return primary, reason
 
     @classmethod
     def get_fallback_order(cls, finder: Dict[str, Any]) -> List[Backend]:
@@ -68,34 +63,64 @@ class BackendSelector:
         Returns:
             List of backends to try in order
         """
-        primary, _ = cls.select(finder)
+        return list(cls.decide(finder)[2])
+
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def _decide(cls, keys: FrozenSet[str], explicit: Optional[str]) -> Tuple[Backend, str, Tuple[Backend, ...]]:
+        primary, reason = cls._select_primary(keys, explicit)
 
         # For driver-only finders, don't fall back to Maestro (it won't work)
-        driver_only = cls.DRIVER_FINDERS - cls.BOTH_FINDERS
-        finder_keys = set(finder.keys()) - {"first", "index", "backend", "timeout"}
-        if finder_keys & driver_only:
-            return [Backend.DRIVER]
+        if any(key in keys for key in cls._DRIVER_ONLY):
+            return primary, reason, (Backend.DRIVER,)
 
         # For maestro-only finders, don't fall back to Driver
-        maestro_only = cls.MAESTRO_FINDERS - cls.BOTH_FINDERS
-        if finder_keys & maestro_only:
-            return [Backend.MAESTRO]
+        if any(key in keys for key in cls._MAESTRO_ONLY):
+            return primary, reason, (Backend.MAESTRO,)
 
         # For finders that work with both, try primary first then fallback
         if primary == Backend.MAESTRO:
-            return [Backend.MAESTRO, Backend.DRIVER]
+            return primary, reason, (Backend.MAESTRO, Backend.DRIVER)
         else:
-            return [Backend.DRIVER, Backend.MAESTRO]
+            return primary, reason, (Backend.DRIVER, Backend.MAESTRO)
+
+    @classmethod
+    def _select_primary(cls, keys: FrozenSet[str], explicit: Optional[str]) -> Tuple[Backend, str]:
+        # Check if backend is explicitly specified
+        if explicit is not None:
+            explicit = explicit.lower()
+            if explicit == "maestro":
+                return Backend.MAESTRO, "explicit backend=maestro"
+            elif explicit == "driver":
+                return Backend.DRIVER, "explicit backend=driver"
+
+        # The partitions hold a handful of names each, so probing the keys
+        # for them is cheaper than intersecting
+
+        # Check for driver-only finders first (they're more specific)
+        for key in cls._DRIVER_ONLY:
+            if key in keys:
+                return Backend.DRIVER, f"{key} finder requires driver"
+
+        # Check for maestro-preferred finders
+        for key in cls._MAESTRO_ONLY:
+            if key in keys:
+                return Backend.MAESTRO, f"{key} finder prefers maestro"
+
+        # For finders that work with both, prefer Maestro (more stable)
+        for key in cls._BOTH:
+            if key in keys:
+                return Backend.MAESTRO, f"{key} finder (maestro preferred)"
+
+        # Default to Maestro
+        return Backend.MAESTRO, "default"
 
     @classmethod
     def can_use_backend(cls, finder: Dict[str, Any], backend: Backend) -> bool:
         """Check if a finder can be used with a specific backend."""
-        finder_keys = set(finder.keys()) - {"first", "index", "backend", "timeout"}
-
         if backend == Backend.MAESTRO:
             # Maestro can't use driver-only finders
-            driver_only = cls.DRIVER_FINDERS - cls.BOTH_FINDERS
-            return not bool(finder_keys & driver_only)
+            return not any(key in finder for key in cls._DRIVER_ONLY)
         else:
             # Driver can use all finders
             return True
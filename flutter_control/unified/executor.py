@@ -1,12 +1,14 @@
 """Unified executor - executes commands with auto-fallback."""
 
+import asyncio
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from .backend_selector import BackendSelector, Backend
+from ..driver.finders import Finder
 from ..logging.trace import TraceContext
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of unified execution."""
     success: bool
@@ -17,6 +19,33 @@ class ExecutionResult:
     fallback_occurred: bool = False
 
 
+def _driver_text(response: Dict[str, Any]) -> Any:
+    # Flutter Driver returns {"response": "text value", "isError": false}
+    return response.get("response") or response.get("text")
+
+
+@dataclass(frozen=True, slots=True)
+class _OpSpec:
+    """How one unified operation maps onto each backend."""
+    maestro_method: Optional[str]  # MaestroWrapper method; None if Maestro can't do it
+    driver_method: str  # FlutterDriverClient method
+    extract: Optional[Callable[[Dict[str, Any]], Any]] = None  # result data from a driver response
+
+
+_OPS: Dict[str, _OpSpec] = {
+    "tap": _OpSpec("tap", "tap"),
+    "get_text": _OpSpec(None, "get_text", extract=_driver_text),
+    "assert_visible": _OpSpec("assert_visible", "wait_for"),
+    "assert_not_visible": _OpSpec("assert_not_visible", "wait_for_absent"),
+}
+
+
+def _retrieve_exception(task: "asyncio.Future[bool]") -> None:
+    """Mark a background attempt's exception as seen (it was logged by the race, or lost it)."""
+    if not task.cancelled():
+        task.exception()
+
+
 class UnifiedExecutor:
     """Executes commands with auto-backend selection and fallback."""
 
@@ -61,52 +90,14 @@ class UnifiedExecutor:
         trace: TraceContext,
         timeout: int = 30,
         device: Optional[str] = None,
+        hedge: bool = False,
     ) -> ExecutionResult:
-        """Tap with auto-backend selection and fallback."""
-        backends = BackendSelector.get_fallback_order(finder)
-        primary, reason = BackendSelector.select(finder)
-        trace.log("BACKEND_SEL", f"{primary.value} (reason: {reason})")
-
-        result = ExecutionResult(success=False, backends_tried=[])
-
-        for backend in backends:
-            result.backends_tried.append(backend.value)
-
-            if backend == Backend.MAESTRO:
-                trace.log("TRY_MAESTRO", f"tap {finder}")
-                maestro_result = await self.maestro.tap(finder, trace, timeout, device)
-                if maestro_result.success:
-                    result.success = True
-                    result.backend_used = Backend.MAESTRO
-                    result.fallback_occurred = len(result.backends_tried) > 1
-                    trace.log("MAESTRO_OK", "tap succeeded")
-                    return result
-                trace.log("MAESTRO_FAIL", maestro_result.error_message or "unknown error")
-
-            elif backend == Backend.DRIVER:
-                if not await self.ensure_driver_connected(trace):
-                    trace.log("DRIVER_SKIP", "not connected")
-                    continue
-
-                trace.log("TRY_DRIVER", f"tap {finder}")
-                from ..driver.finders import Finder
-                try:
-                    driver_finder = Finder.from_dict(finder)
-                    driver_result = await self.driver.tap(driver_finder, trace, timeout)
-                    if driver_result.success:
-                        result.success = True
-                        result.backend_used = Backend.DRIVER
-                        result.fallback_occurred = len(result.backends_tried) > 1
-                        trace.log("DRIVER_OK", "tap succeeded")
-                        return result
-                    trace.log("DRIVER_FAIL", driver_result.error or "unknown error")
-                except ValueError as e:
-                    trace.log("DRIVER_SKIP", f"finder not supported: {e}")
-                    continue
+        """Tap with auto-backend selection and fallback.
 
-        result.error = f"All backends failed: {result.backends_tried}"
-        trace.log("ALL_FAIL", result.error)
-        return result
+        With hedge=True and two viable backends, both are tried at once and the
+        first success wins. Off by default: a tap is not safe to issue twice.
+        """
+        return await self._execute("tap", finder, trace, timeout, device, hedge)
 
     async def get_text(
         self,
@@ -114,47 +105,8 @@ class UnifiedExecutor:
         trace: TraceContext,
         timeout: int = 30,
     ) -> ExecutionResult:
-        """Get text with auto-backend selection and fallback."""
-        backends = BackendSelector.get_fallback_order(finder)
-        primary, reason = BackendSelector.select(finder)
-        trace.log("BACKEND_SEL", f"{primary.value} (reason: {reason})")
-
-        result = ExecutionResult(success=False, backends_tried=[])
-
-        for backend in backends:
-            result.backends_tried.append(backend.value)
-
-            if backend == Backend.DRIVER:
-                if not await self.ensure_driver_connected(trace):
-                    trace.log("DRIVER_SKIP", "not connected")
-                    continue
-
-                trace.log("TRY_DRIVER", f"get_text {finder}")
-                from ..driver.finders import Finder
-                try:
-                    driver_finder = Finder.from_dict(finder)
-                    driver_result = await self.driver.get_text(driver_finder, trace, timeout)
-                    if driver_result.success and driver_result.response:
-                        text = driver_result.response.get("response") or driver_result.response.get("text")
-                        result.success = True
-                        result.data = text
-                        result.backend_used = Backend.DRIVER
-                        result.fallback_occurred = len(result.backends_tried) > 1
-                        trace.log("DRIVER_OK", f"get_text succeeded: {text}")
-                        return result
-                    trace.log("DRIVER_FAIL", driver_result.error or "unknown error")
-                except ValueError as e:
-                    trace.log("DRIVER_SKIP", f"finder not supported: {e}")
-                    continue
-
-            elif backend == Backend.MAESTRO:
-                # Maestro doesn't have a direct get_text, would need to use assertions
-                trace.log("MAESTRO_SKIP", "get_text not supported by Maestro")
-                continue
-
-        result.error = f"All backends failed: {result.backends_tried}"
-        trace.log("ALL_FAIL", result.error)
-        return result
+        """Get text via the driver (Maestro has no direct get_text)."""
+        return await self._execute("get_text", finder, trace, timeout)
 
     async def assert_visible(
         self,
@@ -162,52 +114,14 @@ class UnifiedExecutor:
         trace: TraceContext,
         timeout: int = 30,
         device: Optional[str] = None,
+        hedge: bool = False,
     ) -> ExecutionResult:
-        """Assert visible with auto-backend selection and fallback."""
-        backends = BackendSelector.get_fallback_order(finder)
-        primary, reason = BackendSelector.select(finder)
-        trace.log("BACKEND_SEL", f"{primary.value} (reason: {reason})")
+        """Assert visible with auto-backend selection and fallback.
 
-        result = ExecutionResult(success=False, backends_tried=[])
-
-        for backend in backends:
-            result.backends_tried.append(backend.value)
-
-            if backend == Backend.MAESTRO:
-                trace.log("TRY_MAESTRO", f"assert_visible {finder}")
-                maestro_result = await self.maestro.assert_visible(finder, trace, timeout, device)
-                if maestro_result.success:
-                    result.success = True
-                    result.backend_used = Backend.MAESTRO
-                    result.fallback_occurred = len(result.backends_tried) > 1
-                    trace.log("MAESTRO_OK", "assert_visible succeeded")
-                    return result
-                trace.log("MAESTRO_FAIL", maestro_result.error_message or "unknown error")
-
-            elif backend == Backend.DRIVER:
-                if not await self.ensure_driver_connected(trace):
-                    trace.log("DRIVER_SKIP", "not connected")
-                    continue
-
-                trace.log("TRY_DRIVER", f"wait_for {finder}")
-                from ..driver.finders import Finder
-                try:
-                    driver_finder = Finder.from_dict(finder)
-                    driver_result = await self.driver.wait_for(driver_finder, trace, timeout)
-                    if driver_result.success:
-                        result.success = True
-                        result.backend_used = Backend.DRIVER
-                        result.fallback_occurred = len(result.backends_tried) > 1
-                        trace.log("DRIVER_OK", "wait_for succeeded")
-                        return result
-                    trace.log("DRIVER_FAIL", driver_result.error or "unknown error")
-                except ValueError as e:
-                    trace.log("DRIVER_SKIP", f"finder not supported: {e}")
-                    continue
-
-        result.error = f"All backends failed: {result.backends_tried}"
-        trace.log("ALL_FAIL", result.error)
-        return result
+        hedge=True races both viable backends (see tap); asserts are read-only,
+        so this is safe whenever the extra driver traffic is acceptable.
+        """
+        return await self._execute("assert_visible", finder, trace, timeout, device, hedge)
 
     async def assert_not_visible(
         self,
@@ -215,48 +129,139 @@ class UnifiedExecutor:
         trace: TraceContext,
         timeout: int = 30,
         device: Optional[str] = None,
+        hedge: bool = False,
     ) -> ExecutionResult:
-        """Assert not visible with auto-backend selection and fallback."""
-        backends = BackendSelector.get_fallback_order(finder)
-        primary, reason = BackendSelector.select(finder)
-        trace.log("BACKEND_SEL", f"{primary.value} (reason: {reason})")
+        """Assert not visible with auto-backend selection and fallback (hedge: see assert_visible)."""
+        return await self._execute("assert_not_visible", finder, trace, timeout, device, hedge)
 
+    async def _execute(
+        self,
+        op: str,
+        finder: Dict[str, Any],
+        trace: TraceContext,
+        timeout: int,
+        device: Optional[str] = None,
+        hedge: bool = False,
+    ) -> ExecutionResult:
+        """Run one operation from _OPS on the backends the finder allows."""
+        spec = _OPS[op]
+        primary, reason, backends = BackendSelector.decide(finder)
+        if spec.maestro_method is None:
+            backends = tuple(b for b in backends if b != Backend.MAESTRO)
+            if not backends:
+                # Maestro-only finder: nothing can serve this, don't touch the driver
+                return ExecutionResult(success=False, error=f"No backend supports {op} for this finder")
+        if trace.enabled:
+            trace.log("BACKEND_SEL", f"{primary.value} (reason: {reason})")
+
+        data = None
+
+        async def via_maestro() -> bool:
+            if trace.enabled:
+                trace.log("TRY_MAESTRO", f"{op} {finder}")
+            maestro_result = await getattr(self.maestro, spec.maestro_method)(finder, trace, timeout, device)
+            if maestro_result.success:
+                if trace.enabled:
+                    trace.log("MAESTRO_OK", f"{op} succeeded")
+                return True
+            trace.log("MAESTRO_FAIL", maestro_result.error_message or "unknown error")
+            return False
+
+        async def via_driver() -> bool:
+            nonlocal data
+            if not await self.ensure_driver_connected(trace):
+                trace.log("DRIVER_SKIP", "not connected")
+                return False
+
+            if trace.enabled:
+                trace.log("TRY_DRIVER", f"{spec.driver_method} {finder}")
+            try:
+                driver_finder = Finder.from_dict(finder)
+                driver_result = await getattr(self.driver, spec.driver_method)(driver_finder, trace, timeout)
+                if spec.extract is None:
+                    if driver_result.success:
+                        if trace.enabled:
+                            trace.log("DRIVER_OK", f"{spec.driver_method} succeeded")
+                        return True
+                elif driver_result.success and driver_result.response:
+                    data = spec.extract(driver_result.response)
+                    if trace.enabled:
+                        trace.log("DRIVER_OK", f"{spec.driver_method} succeeded: {data}")
+                    return True
+                trace.log("DRIVER_FAIL", driver_result.error or "unknown error")
+            except ValueError as e:
+                trace.log("DRIVER_SKIP", f"finder not supported: {e}")
+            return False
+
+        result = await self._run(backends, {Backend.MAESTRO: via_maestro, Backend.DRIVER: via_driver}, trace, hedge)
+        result.data = data
+        return result
+
+    async def _run(
+        self,
+        backends: Tuple[Backend, ...],
+        attempts: Dict[Backend, Callable[[], Awaitable[bool]]],
+        trace: TraceContext,
+        hedge: bool = False,
+    ) -> ExecutionResult:
+        """Try backends in fallback order, or race them when hedging."""
         result = ExecutionResult(success=False, backends_tried=[])
+        if hedge and len(backends) > 1:
+            return await self._run_hedged(backends, attempts, trace, result)
+
+        for idx, backend in enumerate(backends):
+            if await attempts[backend]():
+                result.success = True
+                result.backend_used = backend
+                result.fallback_occurred = idx > 0
+                result.backends_tried = [b.value for b in backends[:idx + 1]]
+                return result
+
+        result.backends_tried = [b.value for b in backends]
+        result.error = f"All backends failed: {result.backends_tried}"
+        trace.log("ALL_FAIL", result.error)
+        return result
 
+    async def _run_hedged(
+        self,
+        backends: Tuple[Backend, ...],
+        attempts: Dict[Backend, Callable[[], Awaitable[bool]]],
+        trace: TraceContext,
+        result: ExecutionResult,
+    ) -> ExecutionResult:
+        """Start every backend at once; the first to succeed wins, the rest are cancelled.
+
+        The Maestro attempt is shielded rather than cancelled: its flow keeps
+        running on the device either way, and the reply still has to be read
+        off the Maestro stream, so a losing attempt finishes in the background.
+        """
+        if trace.enabled:
+            trace.log("HEDGE", " + ".join(b.value for b in backends))
+        tasks = {}
         for backend in backends:
-            result.backends_tried.append(backend.value)
-
+            attempt = asyncio.ensure_future(attempts[backend]())
             if backend == Backend.MAESTRO:
-                trace.log("TRY_MAESTRO", f"assert_not_visible {finder}")
-                maestro_result = await self.maestro.assert_not_visible(finder, trace, timeout, device)
-                if maestro_result.success:
-                    result.success = True
-                    result.backend_used = Backend.MAESTRO
-                    result.fallback_occurred = len(result.backends_tried) > 1
-                    trace.log("MAESTRO_OK", "assert_not_visible succeeded")
-                    return result
-                trace.log("MAESTRO_FAIL", maestro_result.error_message or "unknown error")
-
-            elif backend == Backend.DRIVER:
-                if not await self.ensure_driver_connected(trace):
-                    trace.log("DRIVER_SKIP", "not connected")
-                    continue
-
-                trace.log("TRY_DRIVER", f"wait_for_absent {finder}")
-                from ..driver.finders import Finder
-                try:
-                    driver_finder = Finder.from_dict(finder)
-                    driver_result = await self.driver.wait_for_absent(driver_finder, trace, timeout)
-                    if driver_result.success:
+                attempt.add_done_callback(_retrieve_exception)
+                attempt = asyncio.ensure_future(asyncio.shield(attempt))
+            tasks[attempt] = backend
+        result.backends_tried = [b.value for b in backends]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        trace.log("HEDGE_ERR", f"{tasks[task].value}: {task.exception()}")
+                    elif task.result():
                         result.success = True
-                        result.backend_used = Backend.DRIVER
-                        result.fallback_occurred = len(result.backends_tried) > 1
-                        trace.log("DRIVER_OK", "wait_for_absent succeeded")
+                        result.backend_used = tasks[task]
+                        result.fallback_occurred = tasks[task] != backends[0]
                         return result
-                    trace.log("DRIVER_FAIL", driver_result.error or "unknown error")
-                except ValueError as e:
-                    trace.log("DRIVER_SKIP", f"finder not supported: {e}")
-                    continue
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let cancelled attempts unwind (close sockets, kill helpers) before returning
+            await asyncio.gather(*pending, return_exceptions=True)
 
         result.error = f"All backends failed: {result.backends_tried}"
         trace.log("ALL_FAIL", result.error)
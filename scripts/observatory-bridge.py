@@ -9,6 +9,7 @@ Flow: VM:9223 -> Host:9223 (this bridge) -> localhost:9223 (ADB forward) -> emul
 This runs on the HOST Mac, not the VM.
 """
 import asyncio
+import socket
 import sys
 
 # Listen on all interfaces so VM can reach it
@@ -20,40 +21,66 @@ LISTEN_PORT = 9233
 FORWARD_HOST = '127.0.0.1'
 FORWARD_PORT = 9223
 
+# Per-connection, per-direction buffer; VM Service responses (isolate dumps,
+# render trees) run to megabytes, so move them in large pieces
+BUFFER_SIZE = 256 * 1024
 
-async def forward(reader, writer, name):
-    """Forward data between two streams."""
+
+def tune_socket(sock):
+    """Disable Nagle: VM Service RPCs are small and latency-bound."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def quiet_shutdown(sock):
+    """Shut down both directions, ignoring sockets that are already gone."""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+async def forward(src, dst, name):
+    """Pump bytes from src to dst through one reused buffer.
+
+    Raw socket calls instead of StreamReader/StreamWriter: recv_into fills a
+    preallocated bytearray and sendall sends a view of it, so no per-chunk
+    bytes objects are created.
+    """
+    loop = asyncio.get_running_loop()
+    buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
     try:
         while True:
-            data = await reader.read(8192)
-            if not data:
+            n = await loop.sock_recv_into(src, buf)
+            if not n:
                 break
-            writer.write(data)
-            await writer.drain()
+            await loop.sock_sendall(dst, view[:n])
     except asyncio.CancelledError:
         pass
     except Exception as e:
         print(f"[{name}] Error: {e}", file=sys.stderr)
     finally:
-        try:
-            writer.close()
-            await writer.wait_closed()
-        except:
-            pass
+        # Wake the opposite direction too (its recv returns EOF)
+        quiet_shutdown(src)
+        quiet_shutdown(dst)
 
 
-async def handle_client(local_reader, local_writer):
+async def handle_client(client, peer):
     """Handle incoming connection by forwarding to ADB forward port."""
-    peer = local_writer.get_extra_info('peername')
+    loop = asyncio.get_running_loop()
     print(f"[observatory-bridge] Connection from {peer}")
 
+    remote = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    remote.setblocking(False)
     try:
-        remote_reader, remote_writer = await asyncio.open_connection(FORWARD_HOST, FORWARD_PORT)
+        await loop.sock_connect(remote, (FORWARD_HOST, FORWARD_PORT))
         print(f"[observatory-bridge] Connected to ADB forward at {FORWARD_HOST}:{FORWARD_PORT}")
+        tune_socket(client)
+        tune_socket(remote)
 
         await asyncio.gather(
-            forward(local_reader, remote_writer, "client->adb"),
-            forward(remote_reader, local_writer, "adb->client"),
+            forward(client, remote, "client->adb"),
+            forward(remote, client, "adb->client"),
         )
     except ConnectionRefusedError:
         print(f"[observatory-bridge] Connection refused to {FORWARD_HOST}:{FORWARD_PORT}", file=sys.stderr)
@@ -61,23 +88,32 @@ async def handle_client(local_reader, local_writer):
     except Exception as e:
         print(f"[observatory-bridge] Error: {e}", file=sys.stderr)
     finally:
-        try:
-            local_writer.close()
-            await local_writer.wait_closed()
-        except:
-            pass
+        remote.close()
+        client.close()
         print(f"[observatory-bridge] Connection closed from {peer}")
 
 
 async def main():
-    server = await asyncio.start_server(handle_client, LISTEN_HOST, LISTEN_PORT)
-    addr = server.sockets[0].getsockname()
+    loop = asyncio.get_running_loop()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((LISTEN_HOST, LISTEN_PORT))
+    listener.listen(socket.SOMAXCONN)
+    listener.setblocking(False)
+
+    addr = listener.getsockname()
     print(f"[observatory-bridge] Listening on {addr[0]}:{addr[1]}")
     print(f"[observatory-bridge] Forwarding to {FORWARD_HOST}:{FORWARD_PORT} (ADB forward)")
     print(f"[observatory-bridge] VM can now connect to Host:{LISTEN_PORT}")
 
-    async with server:
-        await server.serve_forever()
+    connections = set()
+    with listener:
+        while True:
+            client, peer = await loop.sock_accept(listener)
+            client.setblocking(False)
+            task = asyncio.create_task(handle_client(client, peer))
+            connections.add(task)
+            task.add_done_callback(connections.discard)
 
 
 if __name__ == '__main__':
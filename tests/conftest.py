@@ -1,7 +1,12 @@
 """Pytest configuration and shared fixtures."""
 
 import asyncio
+import fcntl
+import json
 import os
+import sys
+import tempfile
+from dataclasses import asdict
 from pathlib import Path
 
 import pytest
@@ -30,37 +35,61 @@ def pytest_configure(config):
 
     # Validate environment variables - warn about stale IPs
     _validate_environment()
+    _load_token()
+
+
+def _load_token():
+    """Read the token file once into FLUTTER_CONTROL_TOKEN.
+
+    MCPClient and the bootstrap both read the env var, and xdist workers
+    inherit it, so the file is opened once per run instead of once per process.
+    """
+    if os.environ.get("FLUTTER_CONTROL_TOKEN"):
+        return
+    token_file = Path.home() / ".android-mcp-token"
+    if token_file.exists():
+        token = token_file.read_text().strip()
+        if token:
+            os.environ["FLUTTER_CONTROL_TOKEN"] = token
+
+
+# Deprecated env vars and what replaced them
+_LEGACY_VARS = (
+    ("ANDROID_MCP_HOST", "ANDROID_HOST"),
+    ("ANDROID_MCP_PORT", "FLUTTER_CONTROL_PORT"),
+    ("ANDROID_MCP_BRIDGE_HOST", "ANDROID_HOST (single host for all services)"),
+    ("ANDROID_MCP_BRIDGE_PORT", "BRIDGE_PORT"),
+)
+
+_environment_validated = False
 
 
 def _validate_environment():
-    """Check for potentially stale environment variables and set defaults."""
-    # Only validate Android env vars when running Android tests
-    if os.getenv("TEST_PLATFORM") != "android":
+    """Check for potentially stale environment variables and set defaults (once per process)."""
+    global _environment_validated
+    if _environment_validated:
         return
+    _environment_validated = True
 
-    warnings = []
+    env = os.environ
+    # Only validate Android env vars when running Android tests
+    if env.get("TEST_PLATFORM") != "android":
+        return
 
     # Get the canonical ANDROID_HOST
-    android_host = os.getenv("ANDROID_HOST", "phost.local")
+    android_host = env.get("ANDROID_HOST", "phost.local")
 
     # Auto-configure ADB_SERVER_SOCKET for Android tests via proxy
-    if not os.getenv("ADB_SERVER_SOCKET"):
-        os.environ["ADB_SERVER_SOCKET"] = f"tcp:{android_host}:15037"
+    if not env.get("ADB_SERVER_SOCKET"):
+        env["ADB_SERVER_SOCKET"] = f"tcp:{android_host}:15037"
 
     # Check for deprecated/legacy env vars that should be migrated
-    legacy_vars = {
-        "ANDROID_MCP_HOST": "ANDROID_HOST",
-        "ANDROID_MCP_PORT": "FLUTTER_CONTROL_PORT",
-        "ANDROID_MCP_BRIDGE_HOST": "ANDROID_HOST (single host for all services)",
-        "ANDROID_MCP_BRIDGE_PORT": "BRIDGE_PORT",
-    }
-
-    for old_var, new_var in legacy_vars.items():
-        if os.getenv(old_var):
-            warnings.append(
-                f"{old_var} is deprecated.\n"
-                f"         Use: {new_var}"
-            )
+    warnings = [
+        f"{old_var} is deprecated.\n"
+        f"         Use: {new_var}"
+        for old_var, new_var in _LEGACY_VARS
+        if env.get(old_var)
+    ]
 
     # Check ANDROID_HOST for hardcoded IP
     if android_host and "192.168" in android_host:
@@ -70,15 +99,20 @@ def _validate_environment():
         )
 
     if warnings:
-        print("\n" + "=" * 60)
-        print("⚠️  ENVIRONMENT VARIABLE WARNINGS")
-        print("=" * 60)
-        for w in warnings:
-            print(f"  • {w}")
-        print("=" * 60)
-        print("Fix: Remove old vars from ~/.zshrc, use new config:")
-        print("  export ANDROID_HOST=phost.local  # (or omit for default)")
-        print("=" * 60 + "\n")
+        rule = "=" * 60
+        sys.stderr.write("\n".join([
+            "",
+            rule,
+            "⚠️  ENVIRONMENT VARIABLE WARNINGS",
+            rule,
+            *(f"  • {w}" for w in warnings),
+            rule,
+            "Fix: Remove old vars from ~/.zshrc, use new config:",
+            "  export ANDROID_HOST=phost.local  # (or omit for default)",
+            rule,
+            "",
+            "",
+        ]))
 
 
 # Session-scoped fixtures
@@ -90,37 +124,22 @@ def platform_config() -> PlatformConfig:
     return get_platform_config()
 
 
-@pytest.fixture(scope="session")
-def bootstrap_result(platform_config: PlatformConfig) -> BootstrapResult:
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def bootstrap_result(platform_config: PlatformConfig) -> BootstrapResult:
     """Bootstrap test environment before any tests run.
 
     Uses MCP tools to:
     - Start emulator/simulator if not running
     - Launch app with flutter_run (enables Driver/Observatory)
     - Connect to Flutter Driver
+
+    Under xdist the first worker bootstraps and the others reuse its result.
     """
-    token_file = Path.home() / ".android-mcp-token"
-    token = token_file.read_text().strip() if token_file.exists() else ""
-
-    loop = asyncio.new_event_loop()
-    try:
-        if platform_config.is_android:
-            # Use config from PlatformConfig (derived from ANDROID_HOST)
-            bootstrap = AndroidBootstrap(
-                token=token,
-                flutter_control_host=platform_config.mcp_host,
-                flutter_control_port=platform_config.mcp_port,
-            )
-        else:
-            bootstrap = IOSBootstrap(
-                mcp_host=platform_config.mcp_host,
-                mcp_port=platform_config.mcp_port,
-                token=token,
-                device_name=os.getenv("IOS_DEVICE_NAME", "iPhone 16e"),
-            )
-        result = loop.run_until_complete(bootstrap.bootstrap())
-    finally:
-        loop.close()
+    run_id = os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    if run_id:
+        result = await _shared_bootstrap(platform_config, run_id)
+    else:
+        result = await _run_bootstrap(platform_config)
 
     if result.error:
         pytest.exit(f"Bootstrap failed: {result.error}", returncode=1)
@@ -135,6 +154,43 @@ def bootstrap_result(platform_config: PlatformConfig) -> BootstrapResult:
     return result
 
 
+async def _shared_bootstrap(platform_config: PlatformConfig, run_id: str) -> BootstrapResult:
+    """Bootstrap once per xdist run, keyed by the run ID all workers share.
+
+    Workers take an exclusive lock; whoever gets it first bootstraps and
+    writes the result, the rest block until then and read it back.
+    """
+    cache_path = Path(tempfile.gettempdir()) / f"flutter-control-bootstrap-{run_id}.json"
+    with open(cache_path.with_suffix(".lock"), "w") as lock:
+        await asyncio.to_thread(fcntl.flock, lock, fcntl.LOCK_EX)
+        if cache_path.exists():
+            return BootstrapResult(**json.loads(cache_path.read_text()))
+        result = await _run_bootstrap(platform_config)
+        cache_path.write_text(json.dumps(asdict(result)))
+        return result
+
+
+async def _run_bootstrap(platform_config: PlatformConfig) -> BootstrapResult:
+    """Run the platform bootstrap against the MCP server."""
+    token = os.environ.get("FLUTTER_CONTROL_TOKEN", "")
+
+    if platform_config.is_android:
+        # Use config from PlatformConfig (derived from ANDROID_HOST)
+        bootstrap = AndroidBootstrap(
+            token=token,
+            flutter_control_host=platform_config.mcp_host,
+            flutter_control_port=platform_config.mcp_port,
+        )
+    else:
+        bootstrap = IOSBootstrap(
+            mcp_host=platform_config.mcp_host,
+            mcp_port=platform_config.mcp_port,
+            token=token,
+            device_name=os.getenv("IOS_DEVICE_NAME", "iPhone 16e"),
+        )
+    return await bootstrap.bootstrap()
+
+
 @pytest.fixture(scope="session")
 def timing_collector() -> TimingCollector:
     """Session-wide timing collector."""
@@ -190,16 +246,20 @@ def is_ios(platform_config: PlatformConfig) -> bool:
 # Skip conditions
 
 
-@pytest.fixture(autouse=True)
-def skip_by_platform(request, platform_config: PlatformConfig):
-    """Skip tests based on platform markers."""
-    if request.node.get_closest_marker("android_only"):
-        if not platform_config.is_android:
-            pytest.skip("Test only runs on Android")
+def pytest_collection_modifyitems(config, items):
+    """Skip tests based on platform markers.
 
-    if request.node.get_closest_marker("ios_only"):
-        if not platform_config.is_ios:
-            pytest.skip("Test only runs on iOS")
+    Done at collection so skipped tests never enter fixture setup (and never
+    trigger the session bootstrap on their own).
+    """
+    platform_config = get_platform_config()
+    skip_android = pytest.mark.skip(reason="Test only runs on Android")
+    skip_ios = pytest.mark.skip(reason="Test only runs on iOS")
+    for item in items:
+        if not platform_config.is_android and item.get_closest_marker("android_only"):
+            item.add_marker(skip_android)
+        elif not platform_config.is_ios and item.get_closest_marker("ios_only"):
+            item.add_marker(skip_ios)
 
 
 # Hooks for report generation
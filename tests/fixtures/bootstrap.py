@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import os
 import shutil
 import subprocess
@@ -52,6 +54,18 @@ TEST_APP_APK = TEST_APP_DIR / "build" / "app" / "outputs" / "flutter-apk" / "app
 TEST_APP_IOS = TEST_APP_DIR / "build" / "ios" / "iphonesimulator" / "Runner.app"
 
 
+@functools.lru_cache(maxsize=4)
+def _file_md5(path: Path, mtime_ns: int) -> str:
+    """MD5 of a file, cached until it is rewritten (mtime_ns is the cache key)."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "md5").hexdigest()
+
+
+def _is_unknown_tool(result: dict) -> bool:
+    """True if the server predates the tool that was called."""
+    return result.get("error", "").startswith("Unknown tool")
+
+
 @dataclass
 class BootstrapResult:
     """Result of bootstrap operation."""
@@ -81,30 +95,63 @@ class MCPBootstrap:
         self.bridge_url = f"http://{bridge_host}:{bridge_port}" if bridge_host else None
         self.token = token
         self.platform = platform
+        self._client: httpx.AsyncClient | None = None
+        self._adb_warm: asyncio.Task | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Shared client, so bootstrap calls reuse keep-alive connections."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"Authorization": f"Bearer {self.token}"} if self.token else {},
+                timeout=120,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def _warm_adb(self):
+        """Start (or connect to) the adb server ahead of the first adb command."""
+        proc = await asyncio.create_subprocess_exec(
+            find_adb(), "start-server",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=get_adb_env(),
+        )
+        await proc.wait()
+
+    async def _adb_ready(self):
+        """Wait for the adb warm-up started by bootstrap(), if any."""
+        if self._adb_warm is not None:
+            try:
+                await self._adb_warm
+            except OSError:
+                pass  # adb missing; the real command reports it
+            self._adb_warm = None
+
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def _call_mcp(self, tool: str, args: dict | None = None, timeout: int = 120) -> dict:
         """Call MCP tool."""
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-            resp = await client.post(
-                f"{self.mcp_url}/call",
-                headers=headers,
-                json={"name": tool, "arguments": args or {}},
-            )
-            return resp.json()
+        resp = await self._http().post(
+            f"{self.mcp_url}/call",
+            json={"name": tool, "arguments": args or {}},
+            timeout=timeout,
+        )
+        return resp.json()
 
     async def _call_bridge(self, tool: str, args: dict | None = None, timeout: int = 120) -> dict:
         """Call Android MCP Bridge tool."""
         if not self.bridge_url:
             return {"success": False, "error": "No bridge configured"}
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-            resp = await client.post(
-                f"{self.bridge_url}/call",
-                headers=headers,
-                json={"name": tool, "arguments": args or {}},
-            )
-            return resp.json()
+        resp = await self._http().post(
+            f"{self.bridge_url}/call",
+            json={"name": tool, "arguments": args or {}},
+            timeout=timeout,
+        )
+        return resp.json()
 
     async def ensure_device_running(self) -> str | None:
         """Ensure device/emulator is running. Returns device ID."""
@@ -123,8 +170,9 @@ class MCPBootstrap:
                 timeout=180
             )
             if start_result.get("success"):
-                await asyncio.sleep(5)  # Wait for emulator to be fully ready
-                return start_result.get("device_id", "emulator-5554")
+                device_id = start_result.get("device_id", "emulator-5554")
+                await self._wait_boot_completed(device_id)
+                return device_id
             return None
         else:
             # iOS - check for booted simulators via MCP
@@ -142,20 +190,110 @@ class MCPBootstrap:
                 timeout=60
             )
             if start_result.get("success"):
-                await asyncio.sleep(3)
-                return start_result.get("device_id")
+                device_id = start_result.get("device_id")
+                await self._wait_boot_completed(device_id)
+                return device_id
             return None
 
-    async def install_app(self, device_id: str) -> bool:
-        """Install pre-built app to device."""
+    async def _wait_boot_completed(self, device_id: str, timeout: float = 60) -> bool:
+        """Wait until the device reports it has finished booting.
+
+        Android polls sys.boot_completed with a short backoff; iOS blocks on
+        `simctl bootstatus`, which returns once the simulator is booted. Both
+        return straight away on an already-warm device.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                if self.platform != "android":
+                    proc = await asyncio.create_subprocess_exec(
+                        "xcrun", "simctl", "bootstatus", device_id, "-b",
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL,
+                    )
+                    return await proc.wait() == 0
+
+                await self._adb_ready()
+                adb = find_adb()
+                env = get_adb_env()
+                delay = 0.25
+                while True:
+                    proc = await asyncio.create_subprocess_exec(
+                        adb, "-s", device_id, "shell", "getprop", "sys.boot_completed",
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.DEVNULL,
+                        env=env,
+                    )
+                    stdout, _ = await proc.communicate()
+                    if stdout.strip() == b"1":
+                        return True
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 1.5, 1.0)
+        except TimeoutError:
+            print(f"  ⚠ {device_id} did not finish booting within {timeout:.0f}s")
+            return False
+
+    async def _discover_driver(
+        self, device_id: str, tool: str = "flutter_driver_discover", timeout: float = 15
+    ) -> dict:
+        """Retry a discovery tool until the app advertises its VM service."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.25
+        while True:
+            result = await self._call_mcp(
+                tool,
+                {"device": device_id},
+                timeout=30
+            )
+            if result.get("success") or _is_unknown_tool(result) or loop.time() + delay > deadline:
+                return result
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 2.0)
+
+    def check_app_built(self) -> bool:
+        """Check the pre-built app exists (needs no device, so runs first)."""
         if self.platform == "android":
             if not TEST_APP_APK.exists():
                 print(f"  ⚠ APK not found at {TEST_APP_APK}")
                 print(f"  Build it with: cd test_app && flutter build apk --debug")
                 return False
+        elif not TEST_APP_IOS.exists():
+            print(f"  ⚠ iOS app not found at {TEST_APP_IOS}")
+            print(f"  Build it with: cd test_app && flutter build ios --simulator --debug")
+            return False
+        return True
+
+    async def _installed_apk_md5(self, adb: str, env: dict, device_id: str) -> str | None:
+        """MD5 of the test app's base APK as installed on the device, if any."""
+        proc = await asyncio.create_subprocess_exec(
+            adb, "-s", device_id, "shell",
+            f"pm path {TEST_APP_PACKAGE} | head -n 1 | cut -d: -f2 | xargs md5sum",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+        stdout, _ = await proc.communicate()
+        fields = stdout.split()
+        return fields[0].decode() if proc.returncode == 0 and fields else None
+
+    async def install_app(self, device_id: str) -> bool:
+        """Install pre-built app to device (see check_app_built)."""
+        if self.platform == "android":
             # Use adb install with proper env for remote ADB access
+            await self._adb_ready()
             adb = find_adb()
             env = get_adb_env()
+
+            # Skip the push + PackageManager install when the device already
+            # has this exact APK
+            installed, local = await asyncio.gather(
+                self._installed_apk_md5(adb, env, device_id),
+                asyncio.to_thread(_file_md5, TEST_APP_APK, TEST_APP_APK.stat().st_mtime_ns),
+            )
+            if installed == local:
+                print(f"  ✓ Installed APK is up to date, skipping install")
+                return True
+
             proc = await asyncio.create_subprocess_exec(
                 adb, "-s", device_id, "install", "-r", str(TEST_APP_APK),
                 stdout=asyncio.subprocess.PIPE,
@@ -169,10 +307,6 @@ class MCPBootstrap:
             return True
         else:
             # iOS: Install via simctl
-            if not TEST_APP_IOS.exists():
-                print(f"  ⚠ iOS app not found at {TEST_APP_IOS}")
-                print(f"  Build it with: cd test_app && flutter build ios --simulator --debug")
-                return False
             proc = subprocess.run(
                 ["xcrun", "simctl", "install", device_id, str(TEST_APP_IOS)],
                 capture_output=True, text=True
@@ -209,15 +343,16 @@ class MCPBootstrap:
 
         Returns (success, uri).
         """
-        # Wait for app to start and advertise via mDNS
-        await asyncio.sleep(2)
-
-        # Discover URI (uses mDNS on iOS, logcat on Android)
-        result = await self._call_mcp(
-            "flutter_driver_discover",
-            {"device": device_id},
-            timeout=30
-        )
+        # Discover (mDNS on iOS, logcat on Android) and connect in one round
+        # trip, retrying while the app is still starting up
+        result = await self._discover_driver(device_id, "flutter_driver_ensure_connected")
+        if not _is_unknown_tool(result):
+            if not result.get("success"):
+                print(f"  ℹ Driver connect: {result.get('error', 'not found')}")
+            return result.get("success", False), result.get("uri")
+
+        # Older servers: discover, then connect
+        result = await self._discover_driver(device_id)
 
         if not result.get("success"):
             print(f"  ℹ Driver discovery: {result.get('error', 'not found')}")
@@ -239,6 +374,7 @@ class MCPBootstrap:
         """Full bootstrap using MCP tools.
 
         Flow for both platforms:
+        0. Check the pre-built app exists (fail before waiting on a device boot)
         1. Start emulator/simulator if needed (MCP tools)
         2. Install pre-built app (adb/simctl)
         3. Launch app (adb/simctl)
@@ -253,6 +389,15 @@ class MCPBootstrap:
         )
 
         try:
+            # 0. Nothing below can succeed without the build
+            if not self.check_app_built():
+                result.error = "Failed to install app (is it built?)"
+                return result
+
+            # adb server cold start overlaps the MCP device calls below
+            if self.platform == "android":
+                self._adb_warm = asyncio.create_task(self._warm_adb())
+
             # 1. Ensure device is running
             device_id = await self.ensure_device_running()
             if not device_id:
@@ -279,6 +424,9 @@ class MCPBootstrap:
 
         except Exception as e:
             result.error = str(e)
+        finally:
+            await self._adb_ready()
+            await self.aclose()
 
         return result
 
@@ -0,0 +1,45 @@
+"""Integration tests for batched tool calls."""
+
+from .fixtures import MCPClient, TimingCollector
+
+
+class TestBatch:
+    """Test running several tool calls through flutter_batch."""
+
+    async def test_batch_tap_and_assert(
+        self,
+        mcp_client: MCPClient,
+        platform: str,
+        timing_collector: TimingCollector,
+    ):
+        """Test a tap followed by an assertion in a single request."""
+        steps = [
+            {"name": "flutter_tap", "arguments": {"finder": {"text": "Increment"}}},
+            {"name": "flutter_assert_visible", "arguments": {"finder": {"text": "Counter"}}},
+        ]
+
+        async with timing_collector.measure("batch_tap_assert", platform, backend="unified"):
+            result = await mcp_client.call("flutter_batch", {"steps": steps})
+
+        assert result.get("success"), f"Batch failed: {result}"
+        assert result.get("completed") == 2
+        assert [step["name"] for step in result["results"]] == ["flutter_tap", "flutter_assert_visible"]
+
+    async def test_batch_stops_on_error(
+        self,
+        mcp_client: MCPClient,
+        platform: str,
+        timing_collector: TimingCollector,
+    ):
+        """Test that a failing step stops the batch by default."""
+        steps = [
+            {"name": "flutter_unknown_tool", "arguments": {}},
+            {"name": "flutter_tap", "arguments": {"finder": {"text": "Increment"}}},
+        ]
+
+        async with timing_collector.measure("batch_stop_on_error", platform, backend="unified"):
+            result = await mcp_client.call("flutter_batch", {"steps": steps})
+
+        assert not result.get("success")
+        assert result.get("completed") == 1
+        assert "Unknown tool" in result["results"][0]["error"]